@@ -3,74 +3,116 @@ import random
 import pygame
 from Box2D import b2Filter
 from pygame import Vector2
-from util import utils
+
+from MyContactListener import TAG_BALL
+from fonts import get_font
+from sprites import make_circle, sprite_cache
+from teams import get_team
 
 class Ball:
-    def __init__(self, pos, radius, color, text="Yes", vel=Vector2(random.uniform(-0, 0), random.uniform(-0, 0))):
+    contact_tag = TAG_BALL
+
+    def __init__(self, sim, pos, radius, color, text="Yes", vel=Vector2(random.uniform(-0, 0), random.uniform(-0, 0)),
+                 trail_length=30, group=0):
+        self.sim = sim
         self.color = color
         self.radius = radius # The ball's radius
         self.text = text  # Text parameter ("Yes" or "No")
+        self.group = group  # Collision group, see below
         
-        # Set colors based on text
-        if self.text == "Yes":
-            self.edge_color = (0, 255, 0)  # Green edge for "Yes"
-            self.text_color = (0, 255, 0)  # Green text for "Yes"
-            self.trail_color = (0, 255, 0)  # Green trail for "Yes"
-        else:  # "No"
-            self.edge_color = (255, 0, 0)  # Red edge for "No"
-            self.text_color = (255, 0, 0)  # Red text for "No"
-            self.trail_color = (255, 0, 0)  # Red trail for "No"
+        # Set colors based on text (green for "Yes", red for "No", see teams.py)
+        team_color = get_team(self.text)["color"]
+        self.edge_color = team_color
+        self.text_color = team_color
+        self.trail_color = team_color
         
-        self.circle_body = utils.world.CreateDynamicBody(position=(utils.from_Pos((pos.x, pos.y))))
-        self.circle_shape = self.circle_body.CreateCircleFixture(radius=self.radius, density=1, friction=0.0, restitution=1.01)
+        self.circle_body = sim.world.CreateDynamicBody(position=(sim.from_Pos((pos.x, pos.y))))
+        # Balls sharing a negative group never collide with each other (crowd mode)
+        self.circle_shape = self.circle_body.CreateCircleFixture(radius=self.radius, density=1, friction=0.0, restitution=1.01,
+                                                                 filter=b2Filter(groupIndex=group))
         self.circle_body.linearVelocity = vel
         self.circle_body.userData = self
+        self.contact_id = sim.register_body(self)
         self.destroyFlag = False
+        self.prev_position = tuple(self.circle_body.position)
 
         self.trail = []
-        self.trail_length = 30
+        self.trail_length = trail_length  # 0 disables the trail (crowd mode)
         self.isPlaySound = False
 
     def update(self):
+        if not self.trail_length:
+            return
         # Update the trail
         self.trail.append(Vector2(self.getPos()))
         if len(self.trail) > self.trail_length:
             self.trail.pop(0)
 
-    def draw(self):
+    def store_previous_state(self):
+        self.prev_position = tuple(self.circle_body.position)
+
+    def interpolated_position(self, alpha):
+        """Box2D position blended between the previous and current step."""
+        x0, y0 = self.prev_position
+        x1, y1 = self.circle_body.position
+        return (x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha)
+
+    def trail_sprite(self, trail_radius, trail_alpha):
+        # Use the ball's trail color with transparency
+        trail_color = (*self.trail_color[:3], trail_alpha)  # Convert RGB to RGBA with alpha
+        key = ("trail", trail_color, trail_radius)
+        return sprite_cache.get(key, lambda: make_circle(trail_color, trail_radius))
+
+    def body_sprite(self, radius_px):
+        """Black ball, colored edge and centered label, rendered once per look."""
+        key = ("body", self.edge_color, self.text_color, radius_px, self.text)
+        return sprite_cache.get(key, lambda: self.make_body_sprite(radius_px))
+
+    def make_body_sprite(self, radius_px):
+        # Add the text with custom color
+        font_size = int(radius_px * 2.0)  # Font size proportional to radius
+        font = get_font(None, font_size)  # Use default font
+        text = font.render(self.text, True, self.text_color)
+
+        # The label can be wider than the ball, size the sprite to fit both
+        width = max(radius_px * 2 + 1, text.get_width())
+        height = max(radius_px * 2 + 1, text.get_height())
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        center = (width // 2, height // 2)
+
+        # Draw the main ball as black
+        pygame.draw.circle(surface, (0, 0, 0), center, radius_px)
+
+        # Draw the edge with custom color
+        edge_thickness = max(1, int(radius_px * 0.1))  # Edge thickness, minimum 1px
+        pygame.draw.circle(surface, self.edge_color, center, radius_px, edge_thickness)
+
+        # Center the text on the ball
+        surface.blit(text, text.get_rect(center=center))
+        return surface
+
+    def draw(self, screen, alpha=1.0):
+        """Draw the trail and the ball and return the rects they cover."""
+        rects = []
+
         # Draw the trail with color based on ball type
         if len(self.trail) > 0:
-            trail_radius = self.radius * 10  # 10x the size of the ball
+            trail_radius = int(self.radius * 10)  # 10x the size of the ball
             for i, pos in enumerate(self.trail):
-                alpha = int(255 * (i / self.trail_length)*0.1)  # Keep your current transparency
-                # Use the ball's trail color with transparency
-                trail_color = (*self.trail_color[:3], alpha)  # Convert RGB to RGBA with alpha
-                surface = pygame.Surface((trail_radius * 2, trail_radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(surface, trail_color, (trail_radius, trail_radius), int(trail_radius))
-                utils.screen.blit(surface, (int(pos.x - trail_radius), int(pos.y - trail_radius)))
+                trail_alpha = int(255 * (i / self.trail_length)*0.1)  # Keep your current transparency
+                surface = self.trail_sprite(trail_radius, trail_alpha)
+                rects.append(screen.blit(surface, (int(pos.x - trail_radius), int(pos.y - trail_radius))))
 
         # Get the current position
-        position = utils.to_Pos(self.circle_body.position)
+        position = self.sim.to_Pos(self.interpolated_position(alpha))
         pos_x, pos_y = int(position[0]), int(position[1])
-        radius_px = int(self.radius * utils.PPM)
-        
-        # Draw the main ball as black
-        pygame.draw.circle(utils.screen, (0, 0, 0), (pos_x, pos_y), radius_px)
-        
-        # Draw the edge with custom color
-        edge_thickness = max(1, int(radius_px * 0.1))  # Edge thickness, minimum 1px
-        pygame.draw.circle(utils.screen, self.edge_color, (pos_x, pos_y), radius_px, edge_thickness)
-        
-        # Add the text with custom color
-        font_size = int(radius_px * 2.0)  # Font size proportional to radius
-        font = pygame.font.SysFont(None, font_size)  # Use default font
-        text = font.render(self.text, True, self.text_color)
-        
-        # Center the text on the ball
-        text_rect = text.get_rect(center=(pos_x, pos_y))
-        utils.screen.blit(text, text_rect)
+        radius_px = int(self.radius * self.sim.PPM)
+
+        sprite = self.body_sprite(radius_px)
+        rects.append(screen.blit(sprite, (pos_x - sprite.get_width() // 2, pos_y - sprite.get_height() // 2)))
+        return rects
 
     def getPos(self):
         # Get the current position of the ball
-        p = utils.to_Pos(self.circle_body.position)
+        p = self.sim.to_Pos(self.circle_body.position)
         return Vector2(p[0], p[1])
\ No newline at end of file
@@ -1,46 +1,78 @@
-import Box2D
+import numpy as np
 from Box2D import b2ContactListener
 
-from sounds import sounds
+# Type tags, set as a contact_tag class attribute on Ball and RingB so the
+# callback never needs isinstance
+TAG_NONE = 0
+TAG_BALL = 1
+TAG_RING = 2
+
+# Event kinds
+KIND_BALL_RING = 1
+
+# One queued contact: kind, ball id, ring id, ball speed at contact, sim time
+CONTACT_EVENT = np.dtype([
+    ("kind", np.uint8),
+    ("a", np.int32),
+    ("b", np.int32),
+    ("speed", np.float32),
+    ("time", np.float32),
+])
 
 
 class MyContactListener(b2ContactListener):
-    def __init__(self):
+    def __init__(self, sim, capacity=1024):
         super(MyContactListener, self).__init__()
-        self.collisions = []
-        self.ring_collisions = []  # Track ring collisions specifically
+        self.sim = sim
+
+        # Preallocated ring buffer of events, drained once per frame by Game.update
+        self.capacity = capacity
+        self.events = np.zeros(capacity, dtype=CONTACT_EVENT)
+        self.head = 0
+        self.count = 0
+        self.pairs = set()  # (ball id, ring id) queued since the last drain
+
+        self.recorded = 0
+        self.coalesced = 0  # Same ball/ring pair touching again (e.g. two edges) before a drain
+        self.dropped = 0  # Buffer full
 
     def BeginContact(self, contact):
-        fixtureA = contact.fixtureA
-        fixtureB = contact.fixtureB
-        bodyA = fixtureA.body
-        bodyB = fixtureB.body
-
-        # Check if one of the fixtures is the circle and the other is the box
-        from Ball import Ball
-        from RingB import RingB
-        
-        # Check for collisions between balls and rings
-        if (isinstance(bodyA.userData, RingB) and isinstance(bodyB.userData, Ball)) or \
-           (isinstance(bodyA.userData, Ball) and isinstance(bodyB.userData, RingB)):
-            
-            # Add to standard collisions
-            self.collisions.append((bodyA, bodyB))
-            
-            # Extract ball and ring objects
-            ball = bodyB.userData if isinstance(bodyB.userData, Ball) else bodyA.userData
-            ring = bodyA.userData if isinstance(bodyA.userData, RingB) else bodyB.userData
-            
-            # Add to ring collisions with information about which ball collided
-            self.ring_collisions.append((ball, ring))
-            
-            # Play a random Gravity Fall song when the ball touches a ring
-            # (this is for all collisions, we'll handle the "without breaking" logic in game.py)
-            sounds.playRandomGravityFallSong()
+        a = contact.fixtureA.body.userData
+        b = contact.fixtureB.body.userData
+        tag_a = getattr(a, "contact_tag", TAG_NONE)
+        tag_b = getattr(b, "contact_tag", TAG_NONE)
+
+        # Only collisions between balls and rings are queued
+        if tag_a == TAG_BALL and tag_b == TAG_RING:
+            ball, ring = a, b
+        elif tag_a == TAG_RING and tag_b == TAG_BALL:
+            ball, ring = b, a
+        else:
+            return
+
+        key = (ball.contact_id, ring.contact_id)
+        if key in self.pairs:
+            self.coalesced += 1
+            return
+        if self.count == self.capacity:
+            self.dropped += 1
+            return
+
+        self.pairs.add(key)
+        i = (self.head + self.count) % self.capacity
+        self.events[i] = (KIND_BALL_RING, key[0], key[1],
+                          ball.circle_body.linearVelocity.length, self.sim.time)
+        self.count += 1
+        self.recorded += 1
 
     def EndContact(self, contact):
         pass  # Can be implemented if needed
-        
-    def clear_ring_collisions(self):
-        """Clear the ring collisions list"""
-        self.ring_collisions = []
\ No newline at end of file
+
+    def drain(self):
+        """Return queued events in arrival order and empty the queue."""
+        index = (self.head + np.arange(self.count)) % self.capacity
+        events = self.events[index]
+        self.head = (self.head + self.count) % self.capacity
+        self.count = 0
+        self.pairs.clear()
+        return events
@@ -1,15 +1,209 @@
+import colorsys
 import math
-import random
 
+import numpy as np
 import pygame
 from Box2D import b2EdgeShape, Box2D, b2Filter
 from pygame import Vector2
 
-from particle import Explosion
-from util import utils
+from MyContactListener import TAG_RING
+
+
+def kept_edges(size):
+    """Indices of the edges a ring keeps; the rest leave the exit hole."""
+    edges = []
+    for i in range(size):
+        angle = i * (360 / size)
+        if (90 <= angle <= 360):  # Modified: Changed from (0 <= angle <= 300) to move hole higher
+            edges.append(i)
+    return edges
+
+
+def edge_template(size):
+    """Unit-circle endpoints (v1, v2) of every kept edge, shape (2 * edges, 2)."""
+    points = []
+    for i in kept_edges(size):
+        for k in (i, (i + 1) % size):
+            angle = k * (2 * math.pi / size)
+            points.append((math.cos(angle), math.sin(angle)))
+    return np.array(points)
+
+
+RING_SIZE = 50
+EDGE_TEMPLATE = edge_template(RING_SIZE)  # shared by every ring
+
+
+def ring_states(rings, alpha=1.0):
+    """(radius, angle, x, y) columns of every ring, blended with the previous step when alpha < 1."""
+    state = np.array([(r.radius, r.angle, r.prev_radius, r.prev_angle,
+                       r.body.position[0], r.body.position[1]) for r in rings])
+    radius, angle, prev_radius, prev_angle, px, py = state.T
+    if alpha != 1.0:
+        radius = prev_radius + (radius - prev_radius) * alpha
+        angle = prev_angle + (angle - prev_angle) * alpha
+    return radius, angle, px, py
+
+
+def transform_rings(rings, sim, alpha=1.0):
+    """Screen-space edge endpoints of all rings in one vectorized pass.
+
+    Returns an array of shape (len(rings), 2 * edges, 2) built from each
+    ring's radius, angle and center; alpha < 1 blends in the previous step.
+    """
+    if not rings:
+        return np.empty((0,) + EDGE_TEMPLATE.shape)
+    radius, angle, px, py = ring_states(rings, alpha)
+    return edge_points(radius * sim.PPM, angle, px * sim.PPM, sim.height - py * sim.PPM)
+
+
+def edge_points(radius, angle, cx, cy):
+    """Screen points of EDGE_TEMPLATE for rings of pixel radius/center (y down)."""
+    radius = np.atleast_1d(radius)
+    c = (np.cos(angle) * radius).reshape(-1, 1)
+    s = (np.sin(angle) * radius).reshape(-1, 1)
+    ux = EDGE_TEMPLATE[:, 0]
+    uy = EDGE_TEMPLATE[:, 1]
+    points = np.empty((len(radius),) + EDGE_TEMPLATE.shape)
+    points[:, :, 0] = np.reshape(cx, (-1, 1)) + ux * c - uy * s
+    points[:, :, 1] = np.reshape(cy, (-1, 1)) - (ux * s + uy * c)
+    return points
+
+
+def sector_boundaries(size):
+    """Per angular sector, the unit normal angle and distance of the wall that closes it.
+
+    Kept edges close their own sector; sectors in the exit hole are closed by
+    the chord across the hole, which is how ring.points outlines the ring.
+    """
+    step = 2 * math.pi / size
+    kept = set(kept_edges(size))
+    gap = [i for i in range(size) if i not in kept]
+    # The hole is contiguous: the chord joins its first and last vertex
+    first, last = gap[0], gap[-1] + 1
+    chord_angle = (first + last) * step / 2
+    chord_dist = math.cos((last - first) * step / 2)
+
+    angles = []
+    dists = []
+    for i in range(size):
+        if i in kept:
+            angles.append((i + 0.5) * step)
+            dists.append(math.cos(step / 2))
+        else:
+            angles.append(chord_angle)
+            dists.append(chord_dist)
+    return np.cos(angles), np.sin(angles), np.array(dists)
+
+
+SECTOR_NX, SECTOR_NY, SECTOR_DIST = sector_boundaries(RING_SIZE)
+
+
+def hole_chord(size):
+    """Half length and center distance of the chord across the exit hole of a unit ring."""
+    kept = set(kept_edges(size))
+    gap = [i for i in range(size) if i not in kept]
+    half_angle = len(gap) * math.pi / size
+    return math.sin(half_angle), math.cos(half_angle)
+
+
+HOLE_HALF_CHORD, HOLE_CHORD_DIST = hole_chord(RING_SIZE)
+
+
+def ring_escape_mask(rings, positions):
+    """Which balls are outside which rings, shape (len(rings), len(positions)).
+
+    positions are Box2D world coordinates. Each ball is rotated into the
+    ring's frame; its angle picks the sector and a dot product against that
+    sector's wall decides escape, the same answer as a point-in-polygon
+    test on ring.points without walking the polygon.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    if not rings or len(positions) == 0:
+        return np.zeros((len(rings), len(positions)), dtype=bool)
+    state = np.array([(r.radius, r.angle, r.body.position[0], r.body.position[1])
+                      for r in rings])
+    radius, angle, cx, cy = (column[:, None] for column in state.T)
+
+    dx = positions[:, 0] - cx
+    dy = positions[:, 1] - cy
+    # Cheap reject: anything past the circumscribed circle has escaped
+    outside = dx * dx + dy * dy > radius * radius
+
+    c = np.cos(angle)
+    s = np.sin(angle)
+    lx = dx * c + dy * s
+    ly = dy * c - dx * s
+    step = 2 * math.pi / RING_SIZE
+    sector = (np.arctan2(ly, lx) % (2 * math.pi) // step).astype(int) % RING_SIZE
+    beyond_wall = lx * SECTOR_NX[sector] + ly * SECTOR_NY[sector] > radius * SECTOR_DIST[sector]
+    return outside | beyond_wall
+
+
+# Slack added to how far a ball can get in one step: covers a ring shrinking
+# (~0.3 m per step) and the polygon's flat edges sitting inside the radius
+RING_REACH_MARGIN = 1.0
+
+
+def sync_ring_bodies(rings, balls, dt):
+    """Keep Box2D edges moving only on the rings a ball can reach in the next step.
+
+    Out-of-reach rings are frozen: their body stops rotating, so Box2D no
+    longer moves their ~37 edge proxies every step (the bulk of world.Step),
+    and RingB.update turns ring.angle instead. A shrinking ring resizes its
+    edges only while it is within reach, not on every step of the shrink.
+    Bodies are never deactivated: that would reallocate broadphase proxies
+    and a restored snapshot could no longer match the live world.
+
+    A frozen ring that already has a ball across its edges is thawed where
+    its body stopped, not snapped to ring.angle, so no edge jumps into the ball.
+    """
+    if not rings:
+        return
+    if balls:
+        state = np.array([(*ball.circle_body.position, ball.circle_body.linearVelocity.length, ball.radius)
+                          for ball in balls])
+        bx, by, speed, ball_radius = state.T
+        reach = ball_radius.max() + speed.max() * dt + RING_REACH_MARGIN
+        radii = np.array([(r.radius, r.edge_radius, r.body.position[0], r.body.position[1]) for r in rings])
+        radius, edge_radius, cx, cy = (column[:, None] for column in radii.T)
+        dist = np.hypot(bx - cx, by - cy)
+        # Near the ring as it is, or near the stale edges it still has
+        near = ((dist >= np.minimum(radius, edge_radius) - reach) &
+                (dist <= np.maximum(radius, edge_radius) + reach)).any(axis=1)
+        # Balls overlapping the edge circle the ring is about to have
+        straddled = (np.abs(dist - radius) < ball_radius).any(axis=1)
+    else:
+        near = straddled = np.zeros(len(rings), dtype=bool)
+
+    for ring, ring_near, ring_straddled in zip(rings, near.tolist(), straddled.tolist()):
+        if ring_near:
+            if ring.edge_radius != ring.radius:
+                ring.update_physics_body()
+            if ring.frozen:
+                if ring_straddled:
+                    # The drawn ring jumps back to the edges instead
+                    ring.angle = ring.body.angle
+                else:
+                    ring.body.angle = ring.angle
+                ring.body.angularVelocity = ring.spin
+                ring.frozen = False
+        elif not ring.frozen:
+            ring.body.angularVelocity = 0
+            ring.frozen = True
+
+
+def update_ring_points(rings, sim):
+    """Refresh ring.points (used for break detection) for every ring at once."""
+    for ring, points in zip(rings, transform_rings(rings, sim)):
+        ring.points = points
+
 
 class RingB:
-    def __init__(self, id, radius, dir=1, sar=0, hue=0):
+    contact_tag = TAG_RING
+
+    def __init__(self, sim, id, radius, dir=1, sar=0, hue=0):
+        self.sim = sim
+
         # Generate a random color for the ring
         self.original_color = self.generate_random_color()
         self.color = self.original_color  # Current display color
@@ -21,33 +215,39 @@ class RingB:
         self.id = id
         self.sar = sar
         self.hue = hue
-        self.center = Vector2(utils.width/2, utils.height/2)
+        self.center = Vector2(sim.width/2, sim.height/2)
         self.shrink_speed = 15.0  # Speed of shrinking animation
 
         self.rotateDir = dir
-        self.size = 50
-        self.vertices = []
+        self.size = RING_SIZE
+        # Unit-circle directions of the vertices, scaled by the radius
+        self.unit_vertices = []
         for i in range(self.size):
             angle = i * (2 * math.pi / self.size)
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            self.vertices.append((x, y))
+            self.unit_vertices.append((math.cos(angle), math.sin(angle)))
+        self.vertices = [(radius * x, radius * y) for x, y in self.unit_vertices]
+        self.edge_radius = radius  # Radius the Box2D edges were last built for
 
-        pos = Vector2(utils.width / 2, utils.height / 2)
-        self.body = utils.world.CreateStaticBody(position=utils.from_Pos(pos))
+        # Kinematic so Box2D integrates the rotation (Adjust speed multiplier as needed)
+        self.spin = self.rotateDir * 1.5
+        pos = Vector2(sim.width / 2, sim.height / 2)
+        self.body = sim.world.CreateKinematicBody(position=sim.from_Pos(pos),
+                                                  angle=math.radians(90 + 20),
+                                                  angularVelocity=self.spin)
+        # Drawn and escape-tested angle; the body only follows it while a ball
+        # is near (see sync_ring_bodies)
+        self.angle = self.body.angle
+        self.frozen = False
         self.body.userData = self
+        self.contact_id = sim.register_body(self)
+        self.edges = []  # (edge shape, first vertex index), resized in place
 
         self.create_edge_shape()
         self.destroyFlag = False
 
-        self.points = []
-        for i in range(self.size):
-            angle = i * (2 * math.pi / self.size)
-            x = self.center.x + radius * 10 * math.cos(angle)
-            y = self.center.y + radius * 10 * math.sin(angle)
-            self.points.append(Vector2(x, y))
-
-        self.body.angle = math.radians(90 + 20)
+        self.prev_angle = self.angle
+        self.prev_radius = self.radius
+        self.points = transform_rings([self], sim)[0]
         
         # Flag to indicate if this ring is currently shrinking
         self.is_shrinking = False
@@ -55,11 +255,12 @@ class RingB:
     def generate_random_color(self):
         """Generate a random vibrant color for the ring."""
         # Method 1: Using HSV for more vibrant colors
-        h = random.random()  # Random hue between 0 and 1
-        s = random.uniform(0.7, 1.0)  # High saturation for vibrant colors
-        v = random.uniform(0.7, 1.0)  # High value for bright colors
-        r, g, b = utils.hueToRGB(h)
-        return (r, g, b)
+        rng = self.sim.rng["rings"]
+        h = rng.random()  # Random hue between 0 and 1
+        s = rng.uniform(0.7, 1.0)  # High saturation for vibrant colors
+        v = rng.uniform(0.7, 1.0)  # High value for bright colors
+        r, g, b = colorsys.hsv_to_rgb(h, 1, 1)
+        return (int(r * 255), int(g * 255), int(b * 255))
 
     def set_pulse_color(self, pulse_color, intensity):
         """Set the pulse color and intensity for blending."""
@@ -91,28 +292,36 @@ class RingB:
 
     def create_edge_shape(self):
         if self.size == 50:
-            for i in range(self.size):
-                angle = i * (360 / self.size)
-                if (90 <= angle <= 360):  # Modified: Changed from (0 <= angle <= 300) to move hole higher
-                    v1 = self.vertices[i]
-                    v2 = self.vertices[(i + 1) % self.size]
-                    edge = b2EdgeShape(vertices=[v1, v2])
-                    self.body.CreateEdgeFixture(shape=edge, density=1, friction=0.0, restitution=1.2)
+            for i in kept_edges(self.size):
+                v1 = self.vertices[i]
+                v2 = self.vertices[(i + 1) % self.size]
+                edge = b2EdgeShape(vertices=[v1, v2])
+                fixture = self.body.CreateEdgeFixture(shape=edge, density=1, friction=0.0, restitution=1.2)
+                self.edges.append((fixture.shape, i))
         if self.size <= 16:
             for i in range(self.size):
                 v1 = self.vertices[i]
                 v2 = self.vertices[(i + 1) % self.size]
                 edge = b2EdgeShape(vertices=[v1, v2])
-                self.body.CreateEdgeFixture(shape=edge, density=1, friction=0.0, restitution=1.2)
+                fixture = self.body.CreateEdgeFixture(shape=edge, density=1, friction=0.0, restitution=1.2)
+                self.edges.append((fixture.shape, i))
+
+    def store_previous_state(self):
+        self.prev_angle = self.angle
+        self.prev_radius = self.radius
 
     def update(self):
-        # Update the angle of the body based on the rotation speed and direction
-        self.body.angle += utils.deltaTime() * self.rotateDir * 1.5  # Adjust speed multiplier as needed
-        
+        # The body's angular velocity handles rotation during world.Step,
+        # except while sync_ring_bodies keeps it frozen
+        if self.frozen:
+            self.angle += self.spin * self.sim.deltaTime()
+        else:
+            self.angle = self.body.angle
+
         # Handle smooth shrinking if needed
         if self.is_shrinking and self.radius != self.target_radius:
             # Calculate the shrink amount for this frame
-            shrink_amount = self.shrink_speed * utils.deltaTime() * 1.15
+            shrink_amount = self.shrink_speed * self.sim.deltaTime() * 1.15
             
             # Make sure we don't overshoot the target radius
             if abs(self.radius - self.target_radius) <= shrink_amount:
@@ -124,77 +333,45 @@ class RingB:
                     self.radius -= shrink_amount
                 else:
                     self.radius += shrink_amount
-            
-            # Update the vertices and physics body based on new radius
-            self.update_physics_body()
-        
-        # Update the points array for collision detection and rendering
-        self.points = []
-        for fixture in self.body.fixtures:
-            v1 = utils.to_Pos(self.body.transform * fixture.shape.vertices[0])
-            v2 = utils.to_Pos(self.body.transform * fixture.shape.vertices[1])
-            self.points.append(Vector2(v1[0], v1[1]))
-            self.points.append(Vector2(v2[0], v2[1]))
+
+
+        # The edges follow in sync_ring_bodies, once a ball is within reach
+        # self.points is refreshed for all rings at once by update_ring_points
 
     def update_physics_body(self):
-        # Clear existing fixtures
-        for fixture in list(self.body.fixtures):
-            self.body.DestroyFixture(fixture)
-        
-        # Recreate vertices with new radius
-        self.vertices = []
-        for i in range(self.size):
-            angle = i * (2 * math.pi / self.size)
-            x = self.radius * math.cos(angle)
-            y = self.radius * math.sin(angle)
-            self.vertices.append((x, y))
-        
-        # Recreate edge shape
-        self.create_edge_shape()
+        # Move the existing edges to the new radius instead of recreating
+        # fixtures; Box2D refreshes their broadphase bounds on the next step
+        radius = self.radius
+        self.edge_radius = radius
+        self.vertices = [(radius * x, radius * y) for x, y in self.unit_vertices]
+        for shape, i in self.edges:
+            shape.vertices = [self.vertices[i], self.vertices[(i + 1) % self.size]]
 
     def shrink_to(self, target_radius):
         # Set the target radius to shrink to
         self.target_radius = target_radius
         self.is_shrinking = True
 
-    def draw(self):
-        self.draw_edges()
+    def draw(self, screen, points=None):
+        """Draw the ring and return the rect it covers."""
+        return self.draw_edges(screen, self.points if points is None else points)
 
-    def spawParticles(self):
-        particles = []
-        center = Vector2(utils.width/2, utils.height/2)
+    def spawParticles(self, particles):
+        """Emit one particle per ring point into a ParticleSystem."""
+        center = Vector2(self.sim.width/2, self.sim.height/2)
         if self.size == 90:
-            for i in range(0, 360, 1):
-                x = math.cos(math.radians(i)) * self.radius * 10
-                y = math.sin(math.radians(i)) * self.radius * 10
-                pos = center + Vector2(x, y)
-                exp = Explosion(pos.x, pos.y, self.original_color)  # Use original color for particles
-                particles.append(exp)
+            angles = np.radians(np.arange(0, 360, 1))
+            xs = center.x + np.cos(angles) * self.radius * 10
+            ys = center.y + np.sin(angles) * self.radius * 10
+            particles.emit(xs, ys, self.original_color)  # Use original color for particles
         else:
-            for p in self.points:
-                pos = p
-                exp = Explosion(pos.x, pos.y, self.original_color)  # Use original color for particles
-                particles.append(exp)
-        return particles
-
-    def draw_edges(self):
-        for fixture in self.body.fixtures:
-            v1 = utils.to_Pos(self.body.transform * fixture.shape.vertices[0])
-            v2 = utils.to_Pos(self.body.transform * fixture.shape.vertices[1])
-            
-            # Draw line with the current display color (which may be blended)
-            pygame.draw.line(utils.screen, self.color, v1, v2, 4)
-
-    def is_point_in_polygon(self, point, vertices):
-        # Ray-casting algorithm to check if the point is inside the polygon
-        num_vertices = len(vertices)
-        j = num_vertices - 1  # The last vertex is the previous one to the first
-        inside = False
-        for i in range(num_vertices):
-            xi, yi = vertices[i]
-            xj, yj = vertices[j]
-            if ((yi > point.y) != (yj > point.y)) and \
-                    (point.x < (xj - xi) * (point.y - yi) / (yj - yi) + xi):
-                inside = not inside
-            j = i
-        return inside
+            particles.emit(self.points[:, 0], self.points[:, 1], self.original_color)
+
+    def draw_edges(self, screen, points):
+        # points holds (v1, v2) per edge and the edges are consecutive,
+        # so the whole arc is one polyline
+        polyline = points[0::2].tolist()
+        polyline.append(points[-1].tolist())
+
+        # Draw lines with the current display color (which may be blended)
+        return pygame.draw.lines(screen, self.color, False, polyline, 4)
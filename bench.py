@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+BASELINE_FILE = "bench_baseline.json"
+
+
+def scenario_default(frames, seed):
+    """The stock 25-ring game, stepped and drawn every frame."""
+    from simulation import Simulation
+    sim = Simulation(seed=seed)
+    screen = pygame.Surface((sim.width, sim.height))
+
+    def frame():
+        sim.step()
+        screen.fill((0, 0, 0))
+        sim.game.draw(screen)
+    return frame
+
+
+def scenario_shrink(frames, seed):
+    """30 rings, all shrinking at once; shrink again as soon as they settle (no breaks, see breaks)."""
+    from RingB import sync_ring_bodies
+    from simulation import Simulation
+    sim = Simulation(seed=seed)
+    game = sim.game
+    game.max_rings = max(game.max_rings, 30)
+    while len(game.rings) < 30:
+        game.generate_new_ring()
+    screen = pygame.Surface((sim.width, sim.height))
+
+    def frame():
+        if not any(ring.is_shrinking for ring in game.rings):
+            game.shrink_all_rings()
+        for ring in game.rings:
+            ring.update()
+        sync_ring_bodies(game.rings, game.balls, sim.fixed_dt)
+        sim.world.Step(sim.fixed_dt, 6, 2)
+        screen.fill((0, 0, 0))
+        game.draw(screen)
+    return frame
+
+
+def scenario_breaks(frames, seed):
+    """Full steps with a ring broken every 4th frame: body teardown, bursts, respawn and shrink."""
+    import math
+    from simulation import Simulation
+    sim = Simulation(seed=seed)
+    game = sim.game
+    screen = pygame.Surface((sim.width, sim.height))
+    count = [0]
+
+    def frame():
+        count[0] += 1
+        if count[0] % 4 == 0 and game.rings:
+            # Put the Yes ball just past the first ring, it escapes on this step
+            ring = game.rings[0]
+            cx, cy = ring.body.position
+            angle = count[0] * 0.7
+            distance = ring.radius + 0.3
+            game.balls[0].circle_body.position = (cx + distance * math.cos(angle), cy + distance * math.sin(angle))
+        sim.step()
+        screen.fill((0, 0, 0))
+        game.draw(screen)
+    return frame
+
+
+def scenario_particles(frames, seed):
+    """A storm of ring explosions keeping about 10k particles alive."""
+    from particle import ParticleSystem
+    from simulation import Simulation
+    sim = Simulation(seed=seed)
+    particles = ParticleSystem(seed=seed)
+    points = np.concatenate([ring.points for ring in sim.game.rings])
+    screen = pygame.Surface((sim.width, sim.height))
+
+    def frame():
+        while len(particles) < 10000:
+            particles.emit(points[:, 0], points[:, 1], (255, 200, 50))
+        particles.update()
+        screen.fill((0, 0, 0))
+        particles.draw(screen)
+    return frame
+
+
+def scenario_rain(frames, seed):
+    """A dense Rain field sliding around the 25 rings."""
+    from particle import Rain
+    from simulation import Simulation
+    sim = Simulation(seed=seed)
+    rain = Rain(sim, 20000, (120, 160, 255))
+    screen = pygame.Surface((sim.width, sim.height))
+
+    def frame():
+        rain.update(sim.game.rings)
+        screen.fill((0, 0, 0))
+        rain.draw(screen)
+    return frame
+
+
+def scenario_crowd(frames, seed):
+    """100 balls (crowd mode, 50 per team), stepped and drawn."""
+    from simulation import Simulation
+    sim = Simulation(seed=seed, balls_per_team=50)
+    screen = pygame.Surface((sim.width, sim.height))
+
+    def frame():
+        sim.step()
+        screen.fill((0, 0, 0))
+        sim.game.draw(screen)
+    return frame
+
+
+SCENARIOS = {
+    "default": scenario_default,
+    "shrink": scenario_shrink,
+    "breaks": scenario_breaks,
+    "particles": scenario_particles,
+    "rain": scenario_rain,
+    "crowd": scenario_crowd,
+}
+
+
+def run_scenario(name, frames, seed=0):
+    """Time one scenario in this process and return its metrics."""
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))  # Some draws convert surfaces to the display format
+    frame = SCENARIOS[name](frames, seed)
+    frame()  # Warm-up: caches, first allocations
+
+    times = np.empty(frames)
+    start = time.perf_counter()
+    for i in range(frames):
+        t = time.perf_counter()
+        frame()
+        times[i] = time.perf_counter() - t
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(times, (50, 95, 99)) * 1000
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+    return {
+        "frames": frames,
+        "steps_per_s": frames / elapsed,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "peak_mb": peak_mb,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Names of scenarios whose throughput fell more than threshold below baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["steps_per_s"] / base["steps_per_s"]
+        result["vs_baseline"] = ratio
+        if ratio < 1 - threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless performance benchmarks")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help="default: all")
+    parser.add_argument("-n", "--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="fail when steps/s drops more than this fraction below baseline")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.frames, args.seed)))
+        return 0
+
+    results = {}
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}, choose from {', '.join(SCENARIOS)}")
+        # A fresh process per scenario, so peak memory is its own
+        out = subprocess.run([sys.executable, __file__, "--child", name, "-n", str(args.frames),
+                              "--seed", str(args.seed)], check=True, capture_output=True, text=True).stdout
+        results[name] = json.loads(out.strip().splitlines()[-1])
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+
+    print(f"{'scenario':<12}{'steps/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak MB':>9}{'vs base':>9}")
+    for name, r in results.items():
+        ratio = f"{r['vs_baseline']:.2f}x" if "vs_baseline" in r else "-"
+        print(f"{name:<12}{r['steps_per_s']:>10.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+              f"{r['p99_ms']:>9.2f}{r['peak_mb']:>9.1f}{ratio:>9}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"Regressed more than {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+# Kinds of what Simulation.record reports, also the record tags of replay logs
+EVENT_PAUSE = 1  # Pause toggled (an input: replays apply it at the same frame)
+EVENT_BREAK = 2  # ring id, indices of the teams that broke it
+EVENT_CONTACTS = 3  # ball ids, ring ids of the contacts drained this step
@@ -0,0 +1,111 @@
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from mixdown import mixdown
+from simulation import Simulation
+
+
+class FrameExporter:
+    """Step a Simulation at a fixed frame rate and render every frame off-screen.
+
+    Frames are drawn on a canvas the size of the simulation, scaled into a
+    24-bit RGB surface of the output size and written straight from its pixel
+    buffer, so no window is needed and export runs as fast as the CPU allows.
+    """
+
+    def __init__(self, sim, size=(1080, 1920), fps=60):
+        pygame.font.init()
+        self.sim = sim
+        self.fps = fps
+        self.size = size
+        self.frame = 0
+
+        # R, G, B byte order in memory so the buffer is already a raw RGB frame
+        self.output = pygame.Surface(size, 0, 24, (0xFF, 0xFF00, 0xFF0000, 0))
+        self.canvas = pygame.Surface((sim.width, sim.height), 0, self.output)
+        self.packed = self.output.get_pitch() == size[0] * 3
+
+    def render(self):
+        """Advance one frame and return the output surface."""
+        self.sim.advance(1.0 / self.fps)
+        self.canvas.fill((0, 0, 0))
+        self.sim.game.draw(self.canvas, self.sim.alpha)
+        if self.canvas.get_size() == self.size:
+            self.output.blit(self.canvas, (0, 0))
+        else:
+            pygame.transform.scale(self.canvas, self.size, self.output)
+        self.frame += 1
+        return self.output
+
+    def write_raw(self, stream):
+        """Write the current output frame as packed RGB24."""
+        if self.packed:
+            # Write directly from the surface memory, no intermediate bytes
+            view = self.output.get_view("1")
+            stream.write(view)
+            del view  # Release the surface lock
+        else:
+            stream.write(pygame.image.tobytes(self.output, "RGB"))
+
+    def export_raw(self, stream, frames):
+        for _ in range(frames):
+            self.render()
+            self.write_raw(stream)
+
+    def export_png(self, pattern, frames):
+        for _ in range(frames):
+            self.render()
+            pygame.image.save(self.output, pattern % self.frame)
+
+
+def parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export frames faster than real time")
+    parser.add_argument("-o", "--out", default="-",
+                        help="raw RGB file ('-' for stdout) or PNG pattern like frames/%%05d.png")
+    parser.add_argument("--format", choices=("raw", "png"), default="raw")
+    parser.add_argument("--size", type=parse_size, default=(1080, 1920))
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--seconds", type=float, default=65.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--audio", default=None, help="also mix the sound track to this WAV file")
+    args = parser.parse_args(argv)
+
+    sim = Simulation(seed=args.seed)
+    exporter = FrameExporter(sim, args.size, args.fps)
+    frames = int(args.seconds * args.fps)
+    start = time.perf_counter()
+
+    if args.format == "png":
+        exporter.export_png(args.out, frames)
+    elif args.out == "-":
+        exporter.export_raw(sys.stdout.buffer, frames)
+        sys.stdout.buffer.flush()
+    else:
+        frame_bytes = args.size[0] * args.size[1] * 3
+        with open(args.out, "wb", buffering=frame_bytes * 4) as stream:
+            exporter.export_raw(stream, frames)
+
+    if args.audio:
+        mixdown(sim, args.audio)
+
+    elapsed = time.perf_counter() - start
+    w, h = args.size
+    print(f"Exported {frames} frames in {elapsed:.2f}s ({frames / elapsed:.1f} fps)", file=sys.stderr)
+    if args.format == "raw":
+        print(f"Encode with: ffmpeg -f rawvideo -pix_fmt rgb24 -s {w}x{h} -r {args.fps} "
+              f"-i {args.out} out.mp4", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
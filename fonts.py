@@ -0,0 +1,79 @@
+import pygame
+
+from sprites import SpriteCache
+
+PIXEL_FONT = "assets/pixel.ttf"
+
+_fonts = {}  # (file, size) -> Font, None is pygame's default font
+_atlases = {}  # (font, color) -> GlyphAtlas
+text_cache = SpriteCache(maxsize=512)  # (font, text, color) -> rendered text
+
+
+def get_font(name=None, size=30):
+    """Load each (font file, size) once and share it."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()  # Only the font module, not all of pygame
+        font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color):
+    """Antialiased text surface, rendered once per (font, text, color)."""
+    return text_cache.get((font, text, color), lambda: font.render(text, True, color))
+
+
+def get_glyph_atlas(font, color):
+    key = (font, color)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(font, color)
+        _atlases[key] = atlas
+    return atlas
+
+
+class GlyphAtlas:
+    """Per-character surfaces for text that changes every frame, like the timer.
+
+    Strings are composed from cached glyphs instead of being rasterized again.
+    """
+
+    def __init__(self, font, color, chars="0123456789.:-s"):
+        self.font = font
+        self.color = color
+        self.glyphs = {}
+        for c in chars:
+            self.glyph(c)
+
+    def glyph(self, c):
+        surface = self.glyphs.get(c)
+        if surface is None:
+            surface = self.font.render(c, True, self.color)
+            self.glyphs[c] = surface
+        return surface
+
+    def size(self, text):
+        width = 0
+        height = 0
+        for c in text:
+            surface = self.glyph(c)
+            width += surface.get_width()
+            height = max(height, surface.get_height())
+        return width, height
+
+    def get_rect(self, text, **kwargs):
+        """Like Surface.get_rect, e.g. get_rect(text, center=(x, y))."""
+        rect = pygame.Rect((0, 0), self.size(text))
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def draw(self, screen, text, topleft):
+        x, y = topleft
+        for c in text:
+            surface = self.glyph(c)
+            screen.blit(surface, (x, y))
+            x += surface.get_width()
@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import snapshot
+from simulation import Simulation
+
+# Perturbations take the forked Simulation and change it in place before it
+# runs. Bind their arguments with functools.partial so they can be sent to
+# worker processes.
+
+
+def scale_speed(sim, team, factor):
+    """Multiply the velocity of every ball of team by factor."""
+    for ball in sim.game.balls:
+        if ball.text == team:
+            velocity = ball.circle_body.linearVelocity
+            ball.circle_body.linearVelocity = (velocity[0] * factor, velocity[1] * factor)
+
+
+def nudge(sim, team, dx, dy):
+    """Move every ball of team by (dx, dy) meters."""
+    for ball in sim.game.balls:
+        if ball.text == team:
+            x, y = ball.circle_body.position
+            ball.circle_body.position = (x + dx, y + dy)
+
+
+def reseed(sim, seed):
+    """Give the branch its own future: new rings, colors, particles and sounds."""
+    for name, rng in sim.rng.items():
+        rng.seed(f"{seed}:{name}")
+
+
+def fork(blob, perturb=None, sounds=None):
+    """One branch: a fresh Simulation from snapshot.dumps() bytes, perturbed."""
+    sim = snapshot.loads(blob, sounds=sounds)
+    if perturb is not None:
+        perturb(sim)
+    return sim
+
+
+base_blob = None  # Shared prefix, set once per worker
+
+
+def init_worker(blob):
+    global base_blob
+    base_blob = blob
+
+
+def run_branch(task):
+    index, perturb, seconds = task
+    sim = fork(base_blob, perturb)
+    result = sim.run(max_steps=None if seconds is None else int(seconds / sim.fixed_dt))
+    result["branch"] = index
+    return result
+
+
+def run_branches(blob, perturbations, seconds=None, workers=None):
+    """Yield the outcome of every perturbed branch as soon as it finishes.
+
+    The prefix is never simulated again: each worker receives the snapshot
+    bytes once and forks every branch it runs from them. seconds limits how
+    far branches run past the fork (default: to the end of the countdown).
+    """
+    tasks = [(i, perturb, seconds) for i, perturb in enumerate(perturbations)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        init_worker(blob)
+        for task in tasks:
+            yield run_branch(task)
+        return
+
+    with Pool(processes=min(workers, len(tasks)), initializer=init_worker, initargs=(blob,)) as pool:
+        for result in pool.imap_unordered(run_branch, tasks, chunksize=1):
+            yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="What-if branches forked from one point of a game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--balls-per-team", type=int, default=1)
+    parser.add_argument("--log", default=None, help="fork a recorded replay instead of a fresh seeded game")
+    parser.add_argument("--at", type=float, default=40.0, help="fork point, seconds of simulation")
+    parser.add_argument("--team", default="Yes", help="team whose balls are perturbed")
+    parser.add_argument("--speed", type=float, nargs="*", default=[0.9, 0.95, 1.05, 1.1],
+                        help="velocity factors, one branch each")
+    parser.add_argument("--reseed", type=int, nargs="*", default=[], help="extra branches with new RNG seeds")
+    parser.add_argument("--seconds", type=float, default=None, help="how long branches run past the fork")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="default: all cores")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.log:
+        from replay import Replayer
+        sim = Replayer(args.log).seek(round(args.at * 60))  # Logs are stepped at 60 Hz
+    else:
+        sim = Simulation(seed=args.seed, balls_per_team=args.balls_per_team)
+        sim.run(max_steps=round(args.at / sim.fixed_dt))
+    blob = snapshot.dumps(sim)
+    prefix = time.perf_counter() - start
+
+    # Branch 0 is the unperturbed continuation, loaded from the same bytes
+    # as the others rather than sim itself (see snapshot.dumps)
+    perturbations = [None]
+    labels = ["base"]
+    for factor in args.speed:
+        perturbations.append(partial(scale_speed, team=args.team, factor=factor))
+        labels.append(f"{args.team} speed x{factor}")
+    for seed in args.reseed:
+        perturbations.append(partial(reseed, seed=seed))
+        labels.append(f"reseed {seed}")
+
+    for result in run_branches(blob, perturbations, args.seconds, args.workers):
+        result["label"] = labels[result["branch"]]
+        del result["break_times"]
+        print(json.dumps(result))
+        sys.stdout.flush()
+    print(json.dumps({"branches": len(perturbations), "fork_frame": sim.frame, "snapshot_bytes": len(blob),
+                      "prefix_seconds": prefix, "seconds": time.perf_counter() - start}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,77 @@
 import math
-import random
 import pygame
+import numpy as np
 from Box2D import b2TestOverlap
 from pygame import Vector2
 from Ball import Ball
-from RingB import RingB
-from particle import Explosion
-from sounds import Sounds, sounds
-from util import utils
-import time
+from RingB import (HOLE_CHORD_DIST, HOLE_HALF_CHORD, RingB, edge_points, ring_escape_mask, ring_states,
+                   sync_ring_bodies, update_ring_points)
+from particle import ParticleSystem
+from events import EVENT_BREAK, EVENT_CONTACTS, EVENT_PAUSE
+from fonts import get_font, get_glyph_atlas, render_text
+from teams import get_team
+
+# Above this many balls per team, trails are off unless trail_length is given:
+# each trail is ~30 alpha blits per ball per frame
+CROWD_TRAIL_BALLS_PER_TEAM = 4
+TRAIL_LENGTH = 30
+
+# Room left around the biggest ball when shrinking rings, see shrink_all_rings
+ESCAPE_MARGIN = 1.1
 
 class Game:
-    def __init__(self):
-        # Existing attributes
+    def __init__(self, sim, teams=("Yes", "No"), balls_per_team=1, trail_length=None):
+        self.sim = sim
+        if trail_length is None:
+            trail_length = 0 if balls_per_team > CROWD_TRAIL_BALLS_PER_TEAM else TRAIL_LENGTH
+
+        # Teams of labeled balls; scoring, sounds and pulses come from teams.py
+        self.teams = list(teams)
         self.balls = []
+        ball_team = []  # Team index of every ball, same order as self.balls
+
+        if self.teams == ["Yes", "No"] and balls_per_team == 1:
+            # Create "Yes" ball with green color and "No" ball with red color,
+            # moving in different directions
+            starts = [(Vector2(sim.width / 2 - 30, sim.height / 2 - 50), (1, 0.5)),
+                      (Vector2(sim.width / 2 + 30, sim.height / 2 - 50), (-1, 0.5))]
+            group = 0
+            ball_radius = 1
+            self.crowd = False
+        else:
+            # Crowd mode: smaller balls scattered in the gaps between the first
+            # rings, so they start clear of the ring edges. They pass through
+            # each other so cost stays linear in the ball count
+            group = -1
+            ball_radius = 0.4
+            self.crowd = True
+            rng = sim.rng["balls"]
+            starts = []
+            for _ in range(len(self.teams) * balls_per_team):
+                angle = rng.uniform(0, 2 * math.pi)
+                gap = rng.randint(2, 5)
+                dist = (1 + 1.1 * gap + 0.55) * sim.PPM  # Halfway between rings gap and gap + 1
+                pos = Vector2(sim.width / 2 + dist * math.cos(angle), sim.height / 2 + dist * math.sin(angle))
+                heading = rng.uniform(0, 2 * math.pi)
+                starts.append((pos, (1.1 * math.cos(heading), 1.1 * math.sin(heading))))
+
+        for i, (pos, vel) in enumerate(starts):
+            team_index = i % len(self.teams)
+            label = self.teams[team_index]
+            ball = Ball(sim, pos, ball_radius, get_team(label)["color"], label, trail_length=trail_length, group=group)
+            ball.circle_body.linearVelocity = vel
+            self.balls.append(ball)
+            ball_team.append(team_index)
+        self.ball_team = np.array(ball_team, dtype=np.int64)
+
+        # Classic two-ball mode handles, None when the team is absent
+        self.ball_yes = next((ball for ball in self.balls if ball.text == "Yes"), None)
+        self.ball_no = next((ball for ball in self.balls if ball.text == "No"), None)
         
-        # Create "Yes" ball with green color
-        self.ball_yes = Ball(Vector2(utils.width / 2 - 30, utils.height / 2 - 50), 1, (0, 255, 0), "Yes")
-        # Create "No" ball with red color
-        self.ball_no = Ball(Vector2(utils.width / 2 + 30, utils.height / 2 - 50), 1, (255, 0, 0), "No")
-        
-        # Add initial velocity to make them move in different directions
-        self.ball_yes.circle_body.linearVelocity = (1, 0.5)
-        self.ball_no.circle_body.linearVelocity = (-1, 0.5)
-        
-        # Add point counters for both balls
-        self.yes_points = 0
-        self.no_points = 0
+        # Add point counters for every team
+        self.points = {label: 0 for label in self.teams}
         
-        self.particles = []
+        self.particles = ParticleSystem(seed=sim.rng["particles"].getrandbits(64))
         self.boxes = []
         self.rings = []
         
@@ -50,7 +93,7 @@ class Game:
         hueStep = 1.0 / numRings
         sarStep = 0.1 / numRings
         for i in range(numRings):
-            ring = RingB(i + 1, radius, dir, sar, hue)
+            ring = RingB(sim, i + 1, radius, dir, sar, hue)
             radius += 1.1
             sar += sarStep
             hue += hueStep
@@ -60,6 +103,11 @@ class Game:
 
         # Store the initial radii for reference
         self.initial_ring_radii = [ring.radius for ring in self.rings]
+        sync_ring_bodies(self.rings, self.balls, sim.fixed_dt)
+
+        # Balls inside the first ring as of the last step: in crowd mode only they score its break
+        positions = np.array([tuple(ball.circle_body.position) for ball in self.balls])
+        self.inside_first = ~ring_escape_mask(self.rings[:1], positions)[0]
         
         # Track the shrink factor with exponential growth
         self.base_shrink_factor = 0.90  # Base shrink factor (10% reduction)
@@ -71,17 +119,21 @@ class Game:
 
         self.collide = False
         self.waitTime = 0
-        self.sounds = Sounds()
         self.complete = False
         self.spawnTimeInterval = 0
         self.spawnTime = 0.5
 
         # Pulse effect parameters
-        self.pulses = []  # List to track multiple pulses
+        # Pulse timeline: start time (simulation seconds) and 3-color palette of each pulse
+        self.pulse_starts = np.empty(0)
+        self.pulse_palettes = np.empty((0, 3, 3), dtype=np.int64)
         self.pulse_duration = 0.05  # The duration of the pulse per ring
-        self.pulse_colors_yes = [(68, 122, 52), (33, 180, 43), (34, 255, 0)]  # Green pulse for Yes ball
-        self.pulse_colors_no = [(122, 52, 52), (180, 43, 33), (255, 0, 0)]    # Red pulse for No ball
-        self.current_pulse_colors = self.pulse_colors_yes  # Default to green
+        self.pulse_width = 3  # Rings lit at once, one palette color each
+        self.current_pulse_colors = get_team(self.teams[0])["pulse_colors"]
+
+        # Score counters, pre-rendered on their own layer until a score changes
+        self.points_layer_key = None
+        self.points_layer = None
 
         # Countdown timer attributes
         self.timer_start = 65.0  # Start time for the countdown in seconds
@@ -89,71 +141,85 @@ class Game:
         
         # Track which rings are broken for collision detection
         self.broken_rings = set()  # Set to track broken ring IDs
+        self.break_times = []  # Simulation time of every ring break
+
+    @property
+    def yes_points(self):
+        return self.points.get("Yes", 0)
+
+    @property
+    def no_points(self):
+        return self.points.get("No", 0)
     
-    def handle_events(self):
+    def handle_event(self, event):
         # Check for key press events
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_0:  # If the "0" key is pressed
-                    self.paused = not self.paused  # Toggle pause state
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_0:  # If the "0" key is pressed
+                self.toggle_pause()
 
-    def start_pulse(self, is_yes_ball=True):
+    def toggle_pause(self):
+        self.paused = not self.paused  # Toggle pause state
+        self.sim.record(EVENT_PAUSE)
+
+    def start_pulse(self, team="Yes"):
         # Add a new pulse, starting at the first ring
-        # Set the color based on which ball destroyed the ring
-        if is_yes_ball:
-            self.current_pulse_colors = self.pulse_colors_yes
-        else:
-            self.current_pulse_colors = self.pulse_colors_no
-            
-        pulse = {
-            "ring_index": 0,
-            "start_time": time.time(),
-            "colors": self.current_pulse_colors
-        }
-        self.pulses.append(pulse)
+        # Set the color based on which team destroyed the ring
+        self.current_pulse_colors = get_team(team)["pulse_colors"]
+        palette = np.array(self.current_pulse_colors[:self.pulse_width], dtype=np.int64)
+        palette = np.concatenate((palette, np.repeat(palette[-1:], self.pulse_width - len(palette), axis=0)))
+
+        if len(self.pulse_starts) and self.sim.time - self.pulse_starts[-1] < self.pulse_duration:
+            # Still on the same rings as the previous pulse: merge, the newest colors win
+            self.pulse_palettes[-1] = palette
+            return
+        self.pulse_starts = np.append(self.pulse_starts, self.sim.time)
+        self.pulse_palettes = np.concatenate((self.pulse_palettes, palette[None]))
 
     def update_pulses(self):
-        if self.paused:
-            return  # Skip pulse updates if paused
-
-        current_time = time.time()
-
-        # Iterate over each active pulse
-        for pulse in self.pulses[:]:
-            elapsed_time = current_time - pulse["start_time"]
+        """Color the rings under every active pulse in one pass over the timeline.
 
-            # If enough time has passed, move the pulse to the next ring
-            if elapsed_time > self.pulse_duration:
-                pulse["ring_index"] += 1
-                pulse["start_time"] = current_time  # Reset the time for the next ring
+        A pulse lights pulse_width consecutive rings and moves out by one ring
+        every pulse_duration of simulation time. Rings keep the color of the
+        last pulse that lit them; newer pulses win where pulses overlap.
+        """
+        if self.paused or len(self.pulse_starts) == 0:
+            return  # Skip pulse updates if paused
 
-            # If the pulse has gone through all the rings, remove it
-            if pulse["ring_index"] >= len(self.rings):
-                self.pulses.remove(pulse)
-                # Restore original colors for all rings after pulse is complete
-                for ring in self.rings:
-                    # We don't need to reset because rings now have their own colors
-                    pass
-            else:
-                # Update the colors of the rings for this pulse
-                for i, ring in enumerate(self.rings):
-                    if pulse["ring_index"] <= i < pulse["ring_index"] + 3 and i < len(self.rings):  # Cover 3 consecutive rings
-                        # Save the original color before changing it for pulse effect
-                        ring_pulse_index = i - pulse["ring_index"]
-                        if 0 <= ring_pulse_index < len(pulse["colors"]):
-                            ring.color = pulse["colors"][ring_pulse_index]  # Use the color sequence
+        # Ring index of each pulse's head; pulses past the last ring are done
+        head = ((self.sim.time - self.pulse_starts) / self.pulse_duration).astype(np.int64)
+        active = head < len(self.rings)
+        if not active.all():
+            self.pulse_starts = self.pulse_starts[active]
+            self.pulse_palettes = self.pulse_palettes[active]
+            head = head[active]
+            if len(head) == 0:
+                return
+
+        offset = np.arange(len(self.rings))[None, :] - head[:, None]  # (pulses, rings)
+        lit = (offset >= 0) & (offset < self.pulse_width)
+        rings = np.flatnonzero(lit.any(axis=0))
+        # Newest pulse lighting each ring
+        newest = len(head) - 1 - np.argmax(lit[::-1, rings], axis=0)
+        colors = self.pulse_palettes[newest, offset[newest, rings]]
+
+        for i, color in zip(rings.tolist(), colors.tolist()):
+            ring = self.rings[i]
+            color = tuple(color)
+            if ring.pulse_color != color or ring.pulse_intensity != 1.0:
+                ring.set_pulse_color(color, 1.0)  # Only rings whose color changes
 
     def generate_new_ring(self):
         # Always generate a new ring
         if len(self.rings) < self.max_rings:
             # Create a new ring with parameters based on the last destroyed ring
             new_radius = self.largest_radius + 1.1
-            new_dir = random.uniform(0.8, 1.2)  # Random direction for variety
-            new_sar = random.uniform(0.1, 0.9)
-            new_hue = random.random()  # Random hue
+            rng = self.sim.rng["rings"]
+            new_dir = rng.uniform(0.8, 1.2)  # Random direction for variety
+            new_sar = rng.uniform(0.1, 0.9)
+            new_hue = rng.random()  # Random hue
             
             # Create the new ring
-            new_ring = RingB(self.next_ring_id, new_radius, new_dir, new_sar, new_hue)
+            new_ring = RingB(self.sim, self.next_ring_id, new_radius, new_dir, new_sar, new_hue)
             self.rings.append(new_ring)
             
             # Update tracking variables
@@ -165,7 +231,7 @@ class Game:
             return  # Skip timer updates if paused
 
         # Decrease the timer by delta time (adjusted for frames per second)
-        self.timer_current -= utils.deltaTime()
+        self.timer_current -= self.sim.deltaTime()
 
         # Ensure the timer doesn't go below 0
         if self.timer_current < 0:
@@ -197,52 +263,58 @@ class Game:
         # Get the current shrink factor
         shrink_factor = self.get_current_shrink_factor()
         
+        # Never shrink a ring into a trap: it has to stay wide enough for the
+        # biggest ball to fit through its exit hole (and, in classic mode, for
+        # the two balls to pass each other), and the next ring out has to leave
+        # that ball's center room to clear the hole. Otherwise the balls rattle
+        # inside until holes happen to line up, and no ring breaks
+        ball_radius = max((ball.radius for ball in self.balls), default=0) * ESCAPE_MARGIN
+        floor = ball_radius / HOLE_HALF_CHORD
+        if not self.crowd:
+            floor = max(floor, 2 * ball_radius)
+
         # Shrink all rings proportionally by the current shrink factor
         for i, ring in enumerate(self.rings):
             # Calculate the new target radius
-            new_radius = ring.radius * shrink_factor
+            new_radius = max(ring.radius * shrink_factor, floor)
             
             # Set the target radius for smooth shrinking
             ring.shrink_to(new_radius)
+            floor = new_radius * HOLE_CHORD_DIST + ball_radius
 
-    def update(self):
-        self.handle_events()  # Check for events before updating
+    def store_previous_state(self):
+        """Remember ball and ring transforms for render interpolation."""
+        for ball in self.balls:
+            ball.store_previous_state()
+        for ring in self.rings:
+            ring.store_previous_state()
 
+    def update(self):
         if self.paused:
             return  # Skip updates if paused
 
-        utils.world.Step(1.0 / 60.0, 6, 2)
-        utils.time += utils.deltaTime()
+        profiler = self.sim.profiler
+        profiler.begin()
+        self.sim.world.Step(self.sim.deltaTime(), 6, 2)
+        profiler.lap("step")
 
-        if utils.contactListener:
-            # Process collisions (removing handled ones for clarity)
-            utils.contactListener.collisions = []
-            
-            # Process ring collisions that are not breaking events
-            for ball, ring in list(utils.contactListener.ring_collisions):
-                # Skip if this is a ring that's being broken this frame
-                # or if it's already been broken
-                if ring.id in self.broken_rings:
-                    continue
-                    
-                # Check if the ring-breaking conditions are met
-                if len(self.rings) > 0 and ring.id == self.rings[0].id:  # Is it the innermost ring?
-                    ball_pos = ball.getPos()
-                    
-                    # Check if the ball is about to exit the ring's boundaries
-                    # If not, it's just a touch, not a break
-                    if ring.is_point_in_polygon(ball_pos, ring.points):
-                        # This is just a touch, not a break - leave it to contact listener
-                        pass
-            
-            # Clear ring collisions after processing
-            utils.contactListener.clear_ring_collisions()
+        # Drain the contacts queued during the step
+        contact_events = self.sim.contactListener.drain()
+        if len(contact_events) > 0:
+            self.sim.record(EVENT_CONTACTS, contact_events["a"], contact_events["b"])
+            # Play a random Gravity Fall song when a ball touches a ring.
+            # Once per frame: a new song cuts the previous one anyway
+            self.sim.trigger_sound("gravity_fall")
+        profiler.lap("contacts")
+
+        self.sim.time += self.sim.deltaTime()
 
         # Update the countdown timer
         self.update_timer()
 
         # Update all active pulses
         self.update_pulses()
+        profiler.lap("pulses")
 
         # Apply ring shrinking if triggered
         if self.trigger_shrink:
@@ -253,46 +325,55 @@ class Game:
         for ring in self.rings:
             if not ring.destroyFlag:
                 ring.update()
+        update_ring_points([ring for ring in self.rings if not ring.destroyFlag], self.sim)
+        profiler.lap("rings")
 
-        # Update both balls
-        self.ball_yes.update()
-        self.ball_no.update()
+        # Update every ball
+        for ball in self.balls:
+            ball.update()
+        profiler.lap("balls")
 
-        # Check both balls for ring destruction
+        # Check all balls for ring destruction
         if len(self.rings) > 0:
             first_ring = self.rings[0]
             
-            # Check if either ball exits the first ring's boundaries
-            ball_yes_pos = self.ball_yes.getPos()
-            ball_no_pos = self.ball_no.getPos()
-            
-            yes_broke_ring = not first_ring.is_point_in_polygon(ball_yes_pos, first_ring.points)
-            no_broke_ring = not first_ring.is_point_in_polygon(ball_no_pos, first_ring.points)
+            # Check which balls exit the first ring's boundaries, then which teams they belong to.
+            # In crowd mode a ball that was already outside it (left behind by an earlier
+            # break) breaks it without scoring, or stragglers would score every ring after theirs
+            positions = np.array([tuple(ball.circle_body.position) for ball in self.balls])
+            escaped = ring_escape_mask([first_ring], positions)[0]
+            scorers = escaped & self.inside_first if self.crowd else escaped
+            team_broke = np.zeros(len(self.teams), dtype=bool)
+            team_broke[self.ball_team[scorers]] = True
+            breakers = np.flatnonzero(team_broke)
             
-            if yes_broke_ring or no_broke_ring:
+            if escaped.any():
                 first_ring.destroyFlag = True
-                utils.world.DestroyBody(first_ring.body)
+                self.sim.world.DestroyBody(first_ring.body)
+                self.sim.release_body(first_ring)
                 
                 # Add the ring ID to the broken rings set
                 self.broken_rings.add(first_ring.id)
 
                 # Increment the broken rings counter
                 self.rings_broken_count += 1
+                self.break_times.append(self.sim.time)
+                self.sim.record(EVENT_BREAK, first_ring.id, breakers)
 
                 # MODIFICATION: Only increment points if timer is at 60s or below
+                # One point per team whose ball(s) broke the ring
                 if self.timer_current <= 60.0:
-                    if yes_broke_ring:
-                        self.yes_points += 1
-                        # Play "Yes" sound when Yes ball breaks a ring
-                        self.sounds.playYesSound()
-                    if no_broke_ring:
-                        self.no_points += 1
-                        # Play "No" sound when No ball breaks a ring
-                        self.sounds.playNoSound()
+                    for team_index in breakers:
+                        label = self.teams[team_index]
+                        self.points[label] += 1
+                        # Play the team's sound ("Yes"/"No") when it breaks a ring
+                        sound = get_team(label)["sound"]
+                        if sound is not None:
+                            self.sim.trigger_sound(sound)
 
                 # Trigger a new pulse when the first ring is destroyed
-                # Pass which ball broke the ring
-                self.start_pulse(is_yes_ball=yes_broke_ring)
+                # Pass which team broke the ring (the first one in team order)
+                self.start_pulse(self.teams[breakers[0] if len(breakers) else 0])
                 
                 # Set the flag to trigger ring shrinking
                 self.trigger_shrink = True
@@ -300,26 +381,35 @@ class Game:
                 # Always generate a new ring to keep the animation infinite
                 self.generate_new_ring()
 
+                # The next ring is the first one from now on
+                self.inside_first = ~ring_escape_mask(self.rings[1:2], positions)[0]
+            else:
+                self.inside_first = ~escaped
+
         # Destroy rings and spawn particles if necessary
         for ring in self.rings[:]:
             if ring.destroyFlag:
-                self.particles += ring.spawParticles()
+                ring.spawParticles(self.particles)
                 self.rings.remove(ring)
                 # Don't play the generic destroy sound here as we now play specific yes/no sounds
                 # when the ring is actually broken
+        profiler.lap("breaks")
+
+        # Edges and broadphase only for the rings the balls can reach next step
+        sync_ring_bodies(self.rings, self.balls, self.sim.deltaTime())
+        profiler.lap("rings")
 
         # Update particles
-        for exp in self.particles:
-            exp.update()
-            if len(exp.particles) == 0:
-                self.particles.remove(exp)
+        self.particles.update()
+        profiler.lap("particles")
 
-    def draw_timer(self):
+    def draw_timer(self, screen):
         # Positionner le timer à 1/3 de l'écran en hauteur
         timer_text = f"{self.timer_current:.3f}s"
-        font = pygame.font.Font(None, 30)  # Taille de police réduite
-        text_surface = font.render(timer_text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=(utils.width / 2, utils.height / 1.2))
+        font = get_font(None, 30)  # Taille de police réduite
+        # The timer changes every frame: compose it from cached digit glyphs
+        atlas = get_glyph_atlas(font, (255, 255, 255))
+        text_rect = atlas.get_rect(timer_text, center=(self.sim.width / 2, self.sim.height / 1.2))
 
         # Créer un fond légèrement plus grand que le texte
         padding = 8
@@ -329,74 +419,118 @@ class Game:
             text_rect.width + 2 * padding,
             text_rect.height + 2 * padding,
         )
-        pygame.draw.rect(utils.screen, (20, 20, 20), bg_rect)  # Fond gris foncé
+        pygame.draw.rect(screen, (20, 20, 20), bg_rect)  # Fond gris foncé
 
         # Dessiner le texte du timer
-        utils.screen.blit(text_surface, text_rect)
+        atlas.draw(screen, timer_text, text_rect.topleft)
+        return bg_rect
 
-    def draw_points(self):
+    def draw_points(self, screen):
+        # MODIFICATION: Show points only if timer is at 60s or below
+        shown = tuple(self.points[label] if self.timer_current <= 60.0 else 0 for label in self.teams)
+        key = (shown, self.sim.width, self.sim.height)
+        if key != self.points_layer_key:
+            self.points_layer = self.render_points_layer(shown)
+            self.points_layer_key = key
+        surface, topleft = self.points_layer
+        return screen.blit(surface, topleft)
+
+    def render_points_layer(self, shown):
+        """Render the score counters on a transparent surface, with its position."""
         # Positionner les compteurs plus bas (par exemple +30px)
-        y_pos = utils.height / 3.35
+        y_pos = self.sim.height / 3.35
 
-        font = pygame.font.Font(None, 32)
-        
-        # MODIFICATION: Show points only if timer is at 60s or below
-        if self.timer_current <= 60.0:
-            yes_points_display = self.yes_points
-            no_points_display = self.no_points
-        else:
-            yes_points_display = 0
-            no_points_display = 0
-        
-        # Yes ball points avec fond vert
-        yes_text = f"Yes:{yes_points_display}"
-        yes_surface = font.render(yes_text, True, (0, 255, 0))
-        yes_rect = yes_surface.get_rect(midleft=(utils.width / 2 - 90, y_pos))
-
-        yes_bg_rect = pygame.Rect(
-            yes_rect.left - 8,
-            yes_rect.top - 4,
-            yes_rect.width + 16,
-            yes_rect.height + 8
-        )
-        pygame.draw.rect(utils.screen, (30, 60, 30), yes_bg_rect, border_radius=6)
-        utils.screen.blit(yes_surface, yes_rect)
-
-        # No ball points avec fond rouge
-        no_text = f"No:{no_points_display}"
-        no_surface = font.render(no_text, True, (255, 0, 0))
-        no_rect = no_surface.get_rect(midright=(utils.width / 2 + 90, y_pos))
-
-        no_bg_rect = pygame.Rect(
-            no_rect.left - 8,
-            no_rect.top - 4,
-            no_rect.width + 16,
-            no_rect.height + 8
-        )
-        pygame.draw.rect(utils.screen, (60, 30, 30), no_bg_rect, border_radius=6)
-        utils.screen.blit(no_surface, no_rect)
+        font = get_font(None, 32)
 
-    def draw(self):
-        for ring in self.rings:
-            ring.draw()
+        if len(self.teams) == 2:
+            # Yes on the left, No on the right
+            anchors = [("midleft", (self.sim.width / 2 - 90, y_pos)),
+                       ("midright", (self.sim.width / 2 + 90, y_pos))]
+        else:
+            # Rows of up to four centered counters
+            anchors = []
+            for i in range(len(self.teams)):
+                row, col = divmod(i, 4)
+                per_row = min(4, len(self.teams) - row * 4)
+                x = self.sim.width / 2 + (col - (per_row - 1) / 2) * (self.sim.width / 4.5)
+                anchors.append(("center", (x, y_pos + row * 40)))
+
+        counters = []
+        for label, points_display, (anchor, pos) in zip(self.teams, shown, anchors):
+            team = get_team(label)
+
+            # Points avec fond de la couleur de l'équipe
+            surface = render_text(font, f"{label}:{points_display}", team["color"])
+            rect = surface.get_rect(**{anchor: pos})
+
+            bg_rect = pygame.Rect(
+                rect.left - 8,
+                rect.top - 4,
+                rect.width + 16,
+                rect.height + 8
+            )
+            counters.append((team, surface, rect, bg_rect))
+
+        bounds = counters[0][3].unionall([bg_rect for _, _, _, bg_rect in counters])
+        layer = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for team, surface, rect, bg_rect in counters:
+            pygame.draw.rect(layer, team["score_bg"], bg_rect.move(-bounds.x, -bounds.y), border_radius=6)
+            layer.blit(surface, rect.move(-bounds.x, -bounds.y))
+        return layer, bounds.topleft
+
+    def draw(self, screen, alpha=1.0):
+        """Draw the frame and return the dirty rects, back to front."""
+        rects = []
+        profiler = self.sim.profiler
+        profiler.begin()
+
+        # alpha interpolates between the previous and current physics step
+        rects.extend(self.draw_rings(screen, alpha))
+        profiler.lap("draw_rings")
             
-        # Draw both balls
-        self.ball_yes.draw()
-        self.ball_no.draw()
+        # Draw every ball
+        for ball in self.balls:
+            rects.extend(ball.draw(screen, alpha))
+        profiler.lap("draw_balls")
 
-        for exp in self.particles:
-            exp.draw()
+        particles_rect = self.particles.draw(screen)
+        if particles_rect is not None:
+            rects.append(particles_rect)
+        profiler.lap("draw_particles")
 
         # Draw the countdown timer
-        self.draw_timer()
+        rects.append(self.draw_timer(screen))
         
         # Draw the point counters
-        self.draw_points()
+        rects.append(self.draw_points(screen))
+        profiler.lap("hud")
+        return rects
+
+    def draw_rings(self, screen, alpha=1.0):
+        """One polyline per ring, skipping rings that can't reach the window."""
+        if not self.rings:
+            return []
+        ppm = self.sim.PPM
+        radius, angle, px, py = ring_states(self.rings, alpha)
+        radius = radius * ppm
+        cx = px * ppm
+        cy = self.sim.height - py * ppm
+
+        # Past the farthest window corner (plus the line width) a ring can't be seen
+        far_x = np.maximum(cx, screen.get_width() - cx)
+        far_y = np.maximum(cy, screen.get_height() - cy)
+        visible = radius - 2 <= np.hypot(far_x, far_y)
+
+        rects = []
+        points = edge_points(radius, angle, cx, cy)
+        for i in np.flatnonzero(visible):
+            rects.append(self.rings[i].draw(screen, points[i]))
+        return rects
 
     def check_collision(self, ball, box):
-        ballPos = utils.to_Pos(ball.circle_body.position)
-        boxPos = utils.to_Pos(box.box_body.position)
+        ballPos = self.sim.to_Pos(ball.circle_body.position)
+        boxPos = self.sim.to_Pos(box.box_body.position)
 
-        if utils.distance(ballPos[0], ballPos[1], boxPos[0], boxPos[1]) < 67:
+        if math.dist(ballPos, boxPos) < 67:
             return True
         return False
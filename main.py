@@ -1,19 +1,62 @@
+import argparse
 import time
 
 import pygame
 
 from util import utils
-from game import Game
+from sounds import sounds
+from simulation import Simulation
+from renderer import DirtyRectRenderer
+from profiler import FrameProfiler, ProfilerOverlay
+from replay import Recorder
+
+parser = argparse.ArgumentParser(description="Bouncing ball simulation")
+parser.add_argument("--profile", action="store_true", help="show section timings (F3 toggles)")
+parser.add_argument("--profile-out", default=None, help="stream timings to a .csv or .jsonl file")
+parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible game")
+parser.add_argument("--record", default=None, help="write a replay log (see replay.py)")
+args = parser.parse_args()
+
+profiler = FrameProfiler(enabled=args.profile or args.profile_out is not None, out=args.profile_out)
+overlay = ProfilerOverlay(profiler)
+
+sounds.start()  # Decode in the background while the window opens
+sim = Simulation(utils.width, utils.height, sounds=sounds, profiler=profiler, seed=args.seed)
+utils.currentScreen = sim.game
+if args.record:
+    sim.recorder = Recorder(args.record, sim)
+
+
+def quit():
+    if profiler.enabled and sounds.voices is not None:
+        print("Voices:", ", ".join(f"{k} {v}" for k, v in sounds.voices.stats().items()))
+    profiler.close()
+    if args.record:
+        sim.recorder.close(sim)
+    exit(0)
+
+
+# Show the first frame right away, then hold it for a second before starting
+renderer = DirtyRectRenderer(utils.screen)
+renderer.present(sim.game.draw(utils.screen))
+hold_until = time.perf_counter() + 1
+while time.perf_counter() < hold_until:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            quit()
+    pygame.time.wait(10)
+utils.clock.tick()  # Don't count the hold as the first frame's delta time
 
-utils.currentScreen = Game()
-time.sleep(1)
 while True:
-    utils.screen.fill((0, 0, 0), (0, 0, utils.width, utils.height))
+    renderer.clear()  # Only under what was drawn last frame
     utils.initDeltaTime()
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
-            exit(0)
+            quit()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.enabled = not profiler.enabled
+        utils.currentScreen.handle_event(event)
         # if event.type == pygame.KEYDOWN:
         #     utils.currentScreen.onKeyDown(event.key)
         # if event.type == pygame.KEYUP:
@@ -26,11 +69,16 @@ while True:
         # if event.type == pygame.MOUSEWHEEL:
         #     utils.currentScreen.onMouseWheel(event)
 
-    utils.currentScreen.update()
-    utils.currentScreen.draw()
+    sim.advance(utils.deltaTime())
+    sounds.flush()
+    dirty = utils.currentScreen.draw(utils.screen, sim.alpha)
 
-    utils.showFps()
+    dirty.append(utils.showFps())
+    dirty.append(overlay.draw(utils.screen))
 
-    pygame.display.flip()
+    profiler.begin()
+    renderer.present(dirty)
+    profiler.lap("present")
+    profiler.end_frame()
 
 
@@ -0,0 +1,162 @@
+import argparse
+import os
+import sys
+import time
+import wave
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from sound_files import SOUND_FILES, gravity_fall_files
+from sounds import VOICES, VOICE_RULES, VoiceScheduler
+
+
+def read_wav(path):
+    """Decode a PCM WAV file into a float32 (frames, channels) array and its rate."""
+    with wave.open(path, "rb") as w:
+        channels = w.getnchannels()
+        width = w.getsampwidth()
+        rate = w.getframerate()
+        raw = w.readframes(w.getnframes())
+
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width {width} in {path}")
+    return data.reshape(-1, channels), rate
+
+
+def resample(data, src_rate, dst_rate):
+    """Linear-interpolation sample-rate conversion, vectorized over all channels."""
+    if src_rate == dst_rate or len(data) == 0:
+        return data
+    frames = int(round(len(data) * dst_rate / src_rate))
+    positions = np.arange(frames, dtype=np.float64) * (src_rate / dst_rate)
+    left = np.minimum(positions.astype(np.int64), len(data) - 1)
+    right = np.minimum(left + 1, len(data) - 1)
+    frac = (positions - left).astype(np.float32)[:, None]
+    return data[left] * (1.0 - frac) + data[right] * frac
+
+
+class TimelineVoices(VoiceScheduler):
+    """The live VoiceScheduler rules, with voices as sample spans of the mix."""
+
+    def __init__(self, rate, voices=VOICES, rules=VOICE_RULES):
+        super().__init__(voices, rules, channels=[None] * voices)
+        self.rate = rate
+        self.spans = []  # [start, stop, clip] of every voice started
+        self.playing = [None] * voices  # Span of each channel's latest voice
+
+    def busy(self, i, now):
+        span = self.playing[i]
+        return span is not None and span[1] > int(round(now * self.rate))
+
+    def start(self, i, clip, now):
+        start = int(round(now * self.rate))
+        if self.busy(i, now):
+            self.playing[i][1] = start  # Cut short, like Channel.play on a busy channel
+        span = [start, start + len(clip), clip]
+        self.playing[i] = span
+        self.spans.append(span)
+
+
+class OfflineMixer:
+    """Render a Simulation's sound-event timeline to a WAV track.
+
+    Triggers go through the same VoiceScheduler rules as live play:
+    voice budget, priorities, cooldowns and coalescing, and a new
+    gravity-fall clip cuts off the one still playing.
+    """
+
+    def __init__(self, rate=44100, channels=2, voices=VOICES):
+        self.rate = rate
+        self.channels = channels
+        self.voices = voices
+        self.cache = {}  # path -> clip at the mix rate and channel count
+        self.gravity_fall_files = gravity_fall_files()
+
+    def load(self, path):
+        clip = self.cache.get(path)
+        if clip is None:
+            data, rate = read_wav(path)
+            data = resample(data, rate, self.rate)
+            if data.shape[1] != self.channels:
+                # Mono to stereo (or down-mix) by averaging then spreading
+                data = np.repeat(data.mean(axis=1, keepdims=True), self.channels, axis=1)
+            clip = np.ascontiguousarray(data, dtype=np.float32)
+            self.cache[path] = clip
+        return clip
+
+    def clip_path(self, name, variant):
+        if name == "gravity_fall":
+            if not self.gravity_fall_files:
+                return SOUND_FILES["destroy"]  # Same placeholder as Sounds
+            return self.gravity_fall_files[int(variant * len(self.gravity_fall_files))]
+        return SOUND_FILES[name]
+
+    def render(self, events, duration=None):
+        """Mix (time, name, variant) events into a float32 (frames, channels) buffer."""
+        voices = TimelineVoices(self.rate, self.voices)
+        for at, name, variant in events:
+            voices.trigger(name, self.load(self.clip_path(name, variant)), at)
+        voices.flush()
+
+        if duration is not None:
+            total = int(round(duration * self.rate))
+        else:
+            total = max((stop for _, stop, _ in voices.spans), default=0)
+        mix = np.zeros((total, self.channels), dtype=np.float32)
+
+        for start, stop, clip in voices.spans:
+            stop = min(stop, total)
+            if stop > start:
+                mix[start:stop] += clip[:stop - start]
+        return mix
+
+    def to_pcm16(self, mix):
+        return (np.clip(mix, -1.0, 1.0) * 32767.0).astype("<i2")
+
+    def write_wav(self, path, mix):
+        with wave.open(path, "wb") as w:
+            w.setnchannels(self.channels)
+            w.setsampwidth(2)
+            w.setframerate(self.rate)
+            w.writeframes(self.to_pcm16(mix).tobytes())
+
+
+def mixdown(sim, path, rate=44100):
+    """Write the sound track of a finished Simulation to a WAV file."""
+    mixer = OfflineMixer(rate)
+    mixer.write_wav(path, mixer.render(sim.sound_events, sim.time))
+
+
+def main(argv=None):
+    from simulation import Simulation
+
+    parser = argparse.ArgumentParser(description="Run a headless game and mix its audio offline")
+    parser.add_argument("-o", "--out", default="mix.wav")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rate", type=int, default=44100)
+    args = parser.parse_args(argv)
+
+    sim = Simulation(seed=args.seed)
+    sim.run()
+
+    start = time.perf_counter()
+    mixdown(sim, args.out, args.rate)
+    elapsed = time.perf_counter() - start
+    print(f"Mixed {len(sim.sound_events)} sound events in {elapsed:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from simulation import Simulation
+
+
+def run_one(seed):
+    """Run one seeded headless game to the end of the countdown."""
+    sim = Simulation(seed=seed)
+    result = sim.run()
+    result["seed"] = seed
+    return result
+
+
+def run_batch(runs, seed=0, workers=None):
+    """Yield results of `runs` seeded games as soon as each one finishes.
+
+    Every run is independent, so a pool of `workers` processes (all cores
+    by default) scales with the core count.
+    """
+    seeds = range(seed, seed + runs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for s in seeds:
+            yield run_one(s)
+        return
+
+    with Pool(processes=min(workers, runs)) as pool:
+        # chunksize=1 so each result comes back as soon as its run is done
+        for result in pool.imap_unordered(run_one, seeds, chunksize=1):
+            yield result
+
+
+def summarize(results):
+    runs = len(results)
+    if runs == 0:
+        return {"runs": 0}
+    yes_wins = sum(1 for r in results if r["yes_points"] > r["no_points"])
+    no_wins = sum(1 for r in results if r["no_points"] > r["yes_points"])
+    return {
+        "runs": runs,
+        "yes_wins": yes_wins,
+        "no_wins": no_wins,
+        "draws": runs - yes_wins - no_wins,
+        "mean_yes_points": sum(r["yes_points"] for r in results) / runs,
+        "mean_no_points": sum(r["no_points"] for r in results) / runs,
+        "mean_rings_broken": sum(r["rings_broken_count"] for r in results) / runs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo Yes/No outcome runner")
+    parser.add_argument("-n", "--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("-o", "--out", default=None, help="JSON-lines file for per-run results")
+    args = parser.parse_args(argv)
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    results = []
+    start = time.perf_counter()
+    try:
+        for result in run_batch(args.runs, args.seed, args.workers):
+            results.append(result)
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    summary = summarize(results)
+    summary["seconds"] = time.perf_counter() - start
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
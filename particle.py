@@ -1,117 +1,222 @@
-import math
 import random
+import sys
+import numpy as np
 import pygame
-from util import utils
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        # CHANGE 1: Reduce particle size
-        self.radius = random.uniform(1,1)  # Reduced from 1,1
-        angle = random.uniform(80, 90)
+def draw_dots(screen, x, y, colors):
+    """Draw radius-1 dots (as pygame.draw.circle would) at many points at once.
+
+    colors is one RGB color or an (n, 3) array. Pixels are written straight
+    into the surface memory instead of issuing one draw call per dot.
+    """
+    width, height = screen.get_size()
+    pitch = screen.get_pitch()
+    bytesize = screen.get_bytesize()
+    x = np.asarray(x).astype(np.int64)
+    y = np.asarray(y).astype(np.int64)
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.uint8), (len(x), 3))
+
+    buffer = np.frombuffer(screen.get_view("1"), dtype=np.uint8)
+    if bytesize == 3:
+        channel_bytes = [shift // 8 for shift in screen.get_shifts()[:3]]
+        if sys.byteorder == "big":
+            channel_bytes = [2 - b for b in channel_bytes]
+    else:
+        pixels = buffer.view(np.uint16 if bytesize == 2 else np.uint32)
+        row = pitch // bytesize
+        # Pack RGB into the surface's own pixel format
+        shifts = screen.get_shifts()
+        losses = screen.get_losses()
+        mapped = np.zeros(len(colors), dtype=pixels.dtype)
+        for channel in range(3):
+            mapped |= ((colors[:, channel] >> losses[channel]).astype(pixels.dtype)
+                       << shifts[channel])
+        if screen.get_flags() & pygame.SRCALPHA:
+            mapped |= pixels.dtype.type(screen.get_masks()[3])
+
+    # A radius-1 circle covers the 2x2 block up and left of its center
+    for dx, dy in ((-1, -1), (0, -1), (-1, 0), (0, 0)):
+        px = x + dx
+        py = y + dy
+        visible = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        if bytesize == 3:
+            offset = py[visible] * pitch + px[visible] * 3
+            for channel, byte in enumerate(channel_bytes):
+                buffer[offset + byte] = colors[visible, channel]
+        else:
+            pixels[py[visible] * row + px[visible]] = mapped[visible]
+
+    if bytesize != 3:
+        del pixels
+    del buffer  # Unlock the surface
+
+
+class ParticleSystem:
+    """Pooled struct-of-arrays particles, updated and drawn in vectorized passes.
+
+    One dot per emitted point, drifting and fading out. Storage is
+    preallocated NumPy arrays with a free list, so spawning and dying allocate nothing
+    until the pool has to grow.
+    """
+
+    def __init__(self, capacity=4096, seed=None):
+        self.rng = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+        self.capacity = 0
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.vel_x = np.empty(0)
+        self.vel_y = np.empty(0)
+        self.life = np.empty(0, dtype=np.int32)  # 0 means the slot is free
+        self.color = np.empty((0, 3), dtype=np.uint8)
+        self.free = np.empty(0, dtype=np.int64)  # Stack of free slots
+        self.free_count = 0
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        old = self.capacity
+        self.x = np.resize(self.x, capacity)
+        self.y = np.resize(self.y, capacity)
+        self.vel_x = np.resize(self.vel_x, capacity)
+        self.vel_y = np.resize(self.vel_y, capacity)
+        self.life = np.concatenate((self.life, np.zeros(capacity - old, dtype=np.int32)))
+        self.color = np.concatenate((self.color, np.zeros((capacity - old, 3), dtype=np.uint8)))
+
+        free = np.empty(capacity, dtype=np.int64)
+        free[:self.free_count] = self.free[:self.free_count]
+        # Push new slots so the lowest indices are handed out first
+        free[self.free_count:self.free_count + capacity - old] = np.arange(capacity - 1, old - 1, -1)
+        self.free = free
+        self.free_count += capacity - old
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.capacity - self.free_count
+
+    def emit(self, xs, ys, color):
+        """Spawn one particle at each (x, y), like one Explosion per point."""
+        xs = np.asarray(xs, dtype=float).ravel()
+        ys = np.asarray(ys, dtype=float).ravel()
+        n = len(xs)
+        if n == 0:
+            return
+        if n > self.free_count:
+            self.grow(max(self.capacity * 2, len(self) + n))
+
+        slots = self.free[self.free_count - n:self.free_count]
+        self.free_count -= n
+
+        angle = np.radians(self.rng.uniform(80, 90, n))
         # CHANGE 2: Reduce particle speed/dispersion
-        speed = random.uniform(-4, 4)  # Reduced from -3,3
-        self.vel_x = math.cos(math.radians(angle)) * speed
-        self.vel_y = math.sin(math.radians(angle)) * speed
+        speed = self.rng.uniform(-4, 4, n)
+        self.x[slots] = xs
+        self.y[slots] = ys
+        self.vel_x[slots] = np.cos(angle) * speed
+        self.vel_y[slots] = np.sin(angle) * speed
         # CHANGE 3: Reduce particle lifetime
-        self.life = random.randint(10, 30)  # Reduced from 100,150
+        self.life[slots] = self.rng.integers(10, 31, n)
+        self.color[slots] = color
 
     def update(self):
+        alive = self.life > 0
+        # Whole-array passes: free slots drift harmlessly until emit resets them
         self.x += self.vel_x
         self.y += self.vel_y
-        self.life -= 1
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-
-class Explosion:
-    def __init__(self, x, y, color):
-        # Create particles
-        self.particles = []
-        COLORS = [color]
-        # CHANGE 4: Reduce number of particles per explosion
-        for _ in range(1):  # Reduced from 5
-            color = random.choice(COLORS)
-            particle = Particle(x, y, color)
-            self.particles.append(particle)
-
-    def update(self):
-        for particle in self.particles:
-            particle.update()
-        self.particles = [particle for particle in self.particles if particle.life > 0]
-
-    def draw(self):
-        for particle in self.particles:
-            particle.draw(utils.screen)
-
-class Raindrop:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.radius = random.uniform(1, 1)  # Make the raindrops small
-        self.vel_y = random.uniform(2, 10)  # Set the speed for the raindrops
-        self.vel_x = 0  # Horizontal velocity (can be adjusted if needed)
-        self.life = random.randint(300, 500)  # Adjust as needed
-
-    def update(self, rings):
-        self.y += self.vel_y
-        self.x += self.vel_x
+        self.life -= alive
 
-        # Check for collision with the rings
-        for ring in rings:
-            if self.is_colliding_with_ring(ring):
-                self.resolve_collision_with_ring(ring)
-
-        # If the raindrop goes off the bottom, respawn at the top
-        if self.y > utils.height:
-            self.y = -10
-            self.x = random.uniform(0, utils.width)
+        # Recycle particles that just died
+        dead = np.flatnonzero(alive & (self.life == 0))
+        n = len(dead)
+        if n:
+            self.free[self.free_count:self.free_count + n] = dead
+            self.free_count += n
 
     def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.radius))
-
-    def is_colliding_with_ring(self, ring):
-        """Check if the raindrop is colliding with the ring."""
-        ring_center = ring.center
-        distance = math.sqrt((self.x - ring_center.x) ** 2 + (self.y - ring_center.y) ** 2)
-        ring_outer_radius = ring.radius + 5  # Add some padding for collision
-        ring_inner_radius = ring.radius - 5  # Consider the thickness of the ring
+        """Draw the live particles and return their bounding rect (None if none)."""
+        alive = np.flatnonzero(self.life > 0)
+        if len(alive) == 0:
+            return None
+        x = self.x[alive]
+        y = self.y[alive]
+        draw_dots(screen, x, y, self.color[alive])
+        left = int(x.min()) - 1
+        top = int(y.min()) - 1
+        return pygame.Rect(left, top, int(x.max()) + 1 - left, int(y.max()) + 1 - top)
 
-        return ring_inner_radius <= distance <= ring_outer_radius
 
-    def resolve_collision_with_ring(self, ring):
-        """Adjust raindrop's position so it gets pushed to the side of the ring."""
-        ring_center = ring.center
+class Rain:
+    """Vectorized rain field that slides around the rings.
 
-        # Calculate the direction from the ring center to the raindrop
-        direction_x = self.x - ring_center.x
-        direction_y = self.y - ring_center.y
+    All rings share one center, so each drop's distance to it is looked up
+    against the sorted ring radii with a single searchsorted instead of
+    testing every drop against every ring.
+    """
 
-        # Normalize the direction vector
-        magnitude = math.sqrt(direction_x ** 2 + direction_y ** 2)
-        if magnitude > 0:
-            direction_x /= magnitude
-            direction_y /= magnitude
+    def __init__(self, sim, num_drops, color, padding=3):
+        self.sim = sim
+        self.color = color
+        self.padding = padding  # Half line width plus drop radius, in pixels
+        self.rng = np.random.default_rng(sim.rng["particles"].getrandbits(64))
+        self.x = self.rng.uniform(0, sim.width, num_drops)
+        self.y = self.rng.uniform(0, sim.height, num_drops)
+        self.speed = self.rng.uniform(2, 10, num_drops)  # Set the speed for the raindrops
+        self.vel_x = np.zeros(num_drops)
+        self.vel_y = self.speed.copy()
 
+    def __len__(self):
+        return len(self.x)
 
+    def update(self, rings):
+        # Drops fall straight down unless a ring deflects them this frame
+        self.vel_x[:] = 0
+        self.vel_y[:] = self.speed
+        if rings:
+            self.collide(rings)
 
-class Rain:
-    def __init__(self, num_drops, color):
-        self.raindrops = []
-        self.color = color
-        for _ in range(num_drops):
-            x = random.uniform(0, utils.width)
-            y = random.uniform(0, utils.height)
-            raindrop = Raindrop(x, y, self.color)
-            self.raindrops.append(raindrop)
+        self.x += self.vel_x
+        self.y += self.vel_y
 
-    def update(self, rings):
-        for raindrop in self.raindrops:
-            raindrop.update(rings)
+        # If a raindrop goes off the bottom, respawn at the top
+        respawn = np.flatnonzero(self.y > self.sim.height)
+        if len(respawn):
+            self.y[respawn] = -10
+            self.x[respawn] = self.rng.uniform(0, self.sim.width, len(respawn))
+
+    def collide(self, rings):
+        """Slide drops that hit a ring's band along it instead of through it."""
+        center = rings[0].center
+        radii = np.sort([ring.radius * self.sim.PPM for ring in rings])
+
+        dx = self.x - center.x
+        dy = self.y - center.y
+        dist = np.hypot(dx, dy)
+
+        # Nearest ring radius: the one above or below each distance
+        above = np.minimum(np.searchsorted(radii, dist), len(radii) - 1)
+        below = np.maximum(above - 1, 0)
+        nearest = np.where(np.abs(radii[above] - dist) < np.abs(dist - radii[below]),
+                           radii[above], radii[below])
+        hit = np.flatnonzero((np.abs(dist - nearest) <= self.padding) & (dist > 0))
+        if len(hit) == 0:
+            return
+
+        # Unit vector pointing away from the center
+        nx = dx[hit] / dist[hit]
+        ny = dy[hit] / dist[hit]
+        outside = dist[hit] >= nearest[hit]
+
+        # Push the drop to the side of the band it came from
+        side = np.where(outside, nearest[hit] + self.padding, nearest[hit] - self.padding)
+        self.x[hit] = center.x + nx * side
+        self.y[hit] = center.y + ny * side
+
+        # Remove the velocity component heading into the ring, keep the slide
+        vx = self.vel_x[hit]
+        vy = self.vel_y[hit]
+        radial = vx * nx + vy * ny
+        into_ring = np.where(outside, radial < 0, radial > 0)
+        radial = np.where(into_ring, radial, 0.0)
+        self.vel_x[hit] = vx - radial * nx
+        self.vel_y[hit] = vy - radial * ny
 
     def draw(self, screen):
-        for raindrop in self.raindrops:
-            raindrop.draw(screen)
\ No newline at end of file
+        draw_dots(screen, self.x, self.y, self.color)
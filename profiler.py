@@ -0,0 +1,145 @@
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+from fonts import get_font, render_text
+
+# Hot-path sections, in the order they run in a frame
+SECTIONS = (
+    "step", "contacts", "pulses", "rings", "balls", "breaks", "particles",
+    "draw_rings", "draw_balls", "draw_particles", "hud", "present",
+)
+
+
+class FrameProfiler:
+    """Per-section frame timings with rolling percentiles.
+
+    Code being measured calls begin() then lap(name) after each section;
+    lap adds the time since the previous stamp to that section. end_frame()
+    closes the frame. While disabled every call returns right away, so the
+    calls can stay in the game loop.
+    """
+
+    def __init__(self, enabled=False, window=600, out=None):
+        self.enabled = enabled
+        self.window = window  # Frames kept for the percentiles
+        self.history = np.zeros((window, len(SECTIONS)))  # Seconds, ring buffer
+        self.frames = 0
+        self.current = dict.fromkeys(SECTIONS, 0.0)
+        self.last = 0.0
+
+        self.stream = None
+        self.writer = None
+        if out is not None:
+            self.open(out)
+
+    def open(self, path):
+        """Stream one row per frame (milliseconds) to a .csv or .jsonl file."""
+        self.stream = open(path, "w", newline="")
+        if path.endswith(".csv"):
+            self.writer = csv.writer(self.stream)
+            self.writer.writerow(("frame",) + SECTIONS)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+            self.writer = None
+
+    def begin(self):
+        if self.enabled:
+            self.last = time.perf_counter()
+
+    def lap(self, name):
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[name] += now - self.last
+            self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        row = [self.current[name] for name in SECTIONS]
+        self.history[self.frames % self.window] = row
+        self.frames += 1
+        for name in SECTIONS:
+            self.current[name] = 0.0
+
+        if self.stream is not None:
+            ms = [round(t * 1000, 4) for t in row]
+            if self.writer is not None:
+                self.writer.writerow([self.frames] + ms)
+            else:
+                self.stream.write(json.dumps({"frame": self.frames, **dict(zip(SECTIONS, ms))}) + "\n")
+
+    def recent(self):
+        """The last frames still in the window, oldest first, shape (frames, sections)."""
+        if self.frames < self.window:
+            return self.history[:self.frames]
+        return np.roll(self.history, -(self.frames % self.window), axis=0)
+
+    def percentiles(self, q=(50, 95, 99)):
+        """{section: (p50, p95, p99)} in milliseconds over the window."""
+        data = self.recent()
+        if len(data) == 0:
+            return {}
+        values = np.percentile(data, q, axis=0) * 1000
+        return {name: tuple(values[:, i].tolist()) for i, name in enumerate(SECTIONS)}
+
+
+class ProfilerOverlay:
+    """Percentile table and frame-time graph, redrawn a few times per second."""
+
+    def __init__(self, profiler, refresh=0.25, graph_height=60):
+        self.profiler = profiler
+        self.refresh = refresh
+        self.graph_height = graph_height
+        self.surface = None
+        self.updated = 0.0
+
+    def render(self):
+        font = get_font(None, 18)
+        line = font.get_linesize()
+        stats = self.profiler.percentiles()
+        width = 240
+        height = line * (len(stats) + 2) + self.graph_height + 8
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+
+        for x, label in ((4, "ms"), (110, "p50"), (154, "p95"), (198, "p99")):
+            surface.blit(render_text(font, label, (200, 200, 200)), (x, 2))
+        y = 2 + line
+        for name, (p50, p95, p99) in stats.items():
+            # Font isn't monospace: columns by position instead of padding
+            surface.blit(render_text(font, name, (255, 255, 255)), (4, y))
+            for col, value in enumerate((p50, p95, p99)):
+                color = (255, 120, 120) if value > 16.7 else (255, 255, 255)
+                # Numbers change every refresh, not worth a text_cache entry
+                surface.blit(font.render(f"{value:.2f}", True, color), (110 + col * 44, y))
+            y += line
+
+        # Frame total over the window, 16.7 ms (60 fps) at mid height
+        totals = self.profiler.recent().sum(axis=1) * 1000
+        top = y + 4
+        scale = self.graph_height / 33.3
+        pygame.draw.line(surface, (90, 90, 90), (0, top + self.graph_height // 2),
+                         (width, top + self.graph_height // 2))
+        if len(totals) > 1:
+            totals = totals[-width:]
+            xs = np.arange(len(totals)) * (width / len(totals))
+            ys = top + self.graph_height - np.minimum(totals * scale, self.graph_height)
+            pygame.draw.lines(surface, (120, 255, 120), False, np.column_stack((xs, ys)).tolist())
+        return surface
+
+    def draw(self, screen, topleft=(0, 20)):
+        """Draw the overlay and return its rect, or None while profiling is off."""
+        if not self.profiler.enabled:
+            return None
+        now = time.perf_counter()
+        if self.surface is None or now - self.updated >= self.refresh:
+            self.surface = self.render()
+            self.updated = now
+        return screen.blit(self.surface, topleft)
@@ -0,0 +1,80 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Present only the parts of the screen that changed since the last frame.
+
+    Instead of filling the whole screen, the cached background is copied back
+    under last frame's rects, the frame is drawn on top, and only the union of
+    the old and new rects is sent to the display. When most of the screen is
+    dirty anyway, a plain flip is cheaper than a long rect list.
+
+    Only the score counters get a layer of their own (Game.draw_points).
+    There are no per-layer surfaces for rings, balls and particles and no
+    static background beyond the clear color: every ring rotates every
+    frame, so nothing there stays still long enough to cache, and while
+    rings fill the window most frames still end up as a full flip.
+    """
+
+    def __init__(self, screen, background=(0, 0, 0), full_ratio=0.6, max_rects=48):
+        self.screen = screen
+        if isinstance(background, pygame.Surface):
+            self.background = background.convert(screen)
+            self.color = None
+        else:
+            # A plain color is restored with fill, much cheaper than a blit
+            self.background = pygame.Surface(screen.get_size()).convert(screen)
+            self.background.fill(background)
+            self.color = background
+        self.bounds = screen.get_rect()
+        self.full_ratio = full_ratio
+        self.max_rects = max_rects
+        self.previous = []  # Merged rects drawn last frame, to erase
+        self.needs_flip = True
+
+        self.screen.blit(self.background, (0, 0))
+
+    def invalidate(self):
+        """Redraw and present the whole screen next frame (e.g. after a resize)."""
+        self.screen.blit(self.background, (0, 0))
+        self.needs_flip = True
+
+    def clear(self):
+        """Restore the background under everything drawn last frame."""
+        for rect in self.previous:
+            if self.color is not None:
+                self.screen.fill(self.color, rect)
+            else:
+                self.screen.blit(self.background, rect, rect)
+
+    def present(self, rects):
+        """Send the rects drawn this frame, and the ones they replaced, to the display."""
+        rects = [self.bounds.clip(rect) for rect in rects if rect]
+        rects = merge_rects([rect for rect in rects if rect.width and rect.height], self.max_rects)
+        dirty = merge_rects(self.previous + rects, self.max_rects)
+        self.previous = rects
+
+        area = sum(rect.width * rect.height for rect in dirty)
+        if self.needs_flip or area > self.full_ratio * self.bounds.width * self.bounds.height:
+            pygame.display.flip()
+            self.needs_flip = False
+        else:
+            pygame.display.update(dirty)
+        return dirty
+
+
+def merge_rects(rects, max_rects=48):
+    """Merge overlapping rects; past max_rects everything collapses into one."""
+    if len(rects) > max_rects:
+        return [rects[0].unionall(rects[1:])]
+
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # Absorb every merged rect this one touches, until nothing overlaps
+        hit = rect.collidelist(merged)
+        while hit != -1:
+            rect.union_ip(merged.pop(hit))
+            hit = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
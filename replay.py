@@ -0,0 +1,285 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+import snapshot
+from events import EVENT_BREAK, EVENT_CONTACTS, EVENT_PAUSE
+from simulation import Simulation
+
+MAGIC = b"BBSLOG02"  # 02: keyframes in snapshot.pack() format
+HEADER = struct.Struct("<8sI")  # magic, length of the JSON config that follows
+RECORD = struct.Struct("<BI")  # kind, frame
+BREAK = struct.Struct("<iH")  # ring id, team count (then one u16 per team)
+COUNT = struct.Struct("<I")
+
+# Log-only record kinds, after the events.py ones
+RECORD_KEYFRAME = 100  # zlib-compressed snapshot.pack()
+RECORD_END = 101  # crc32 of the final result
+
+
+class ReplayDivergence(Exception):
+    def __init__(self, frame, expected, got):
+        super().__init__(f"frame {frame}: expected {expected}, got {got}")
+        self.frame = frame
+        self.expected = expected
+        self.got = got
+
+
+def normalize(kind, payload):
+    """Event payload as plain ints, the same whether recorded or replayed."""
+    if kind == EVENT_BREAK:
+        ring_id, teams = payload
+        return int(ring_id), tuple(int(t) for t in teams)
+    if kind == EVENT_CONTACTS:
+        balls, rings = payload
+        return tuple(np.asarray(balls).tolist()), tuple(np.asarray(rings).tolist())
+    return ()
+
+
+def result_crc(sim):
+    return zlib.crc32(json.dumps(sim.result(), sort_keys=True).encode())
+
+
+class Recorder:
+    """Write a run's seed, config, inputs and events to a compact binary log.
+
+    Attach with sim.recorder = Recorder(path, sim). A keyframe (full
+    snapshot) is stored every keyframe_interval steps, so a replay can seek
+    without simulating from the start.
+    """
+
+    def __init__(self, path, sim, keyframe_interval=600):
+        self.stream = open(path, "wb")
+        self.keyframe_interval = keyframe_interval
+        config = json.dumps(sim.config()).encode()
+        self.stream.write(HEADER.pack(MAGIC, len(config)))
+        self.stream.write(config)
+        self.keyframe(sim)
+
+    def event(self, frame, kind, payload):
+        self.stream.write(RECORD.pack(kind, frame))
+        if kind == EVENT_BREAK:
+            ring_id, teams = normalize(kind, payload)
+            self.stream.write(BREAK.pack(ring_id, len(teams)))
+            self.stream.write(np.asarray(teams, dtype="<u2").tobytes())
+        elif kind == EVENT_CONTACTS:
+            balls, rings = payload
+            self.stream.write(COUNT.pack(len(balls)))
+            self.stream.write(np.asarray(balls, dtype="<i4").tobytes())
+            self.stream.write(np.asarray(rings, dtype="<i4").tobytes())
+
+    def stepped(self, sim):
+        if sim.frame % self.keyframe_interval == 0:
+            self.keyframe(sim)
+
+    def keyframe(self, sim):
+        blob = zlib.compress(snapshot.pack(sim))
+        self.stream.write(RECORD.pack(RECORD_KEYFRAME, sim.frame))
+        self.stream.write(COUNT.pack(len(blob)))
+        self.stream.write(blob)
+
+    def close(self, sim):
+        self.stream.write(RECORD.pack(RECORD_END, sim.frame))
+        self.stream.write(COUNT.pack(result_crc(sim)))
+        self.stream.close()
+
+
+class ReplayLog:
+    """A parsed log: config, events in order, keyframe blobs (decoded on demand)."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay log")
+        pos = HEADER.size
+        self.config = json.loads(data[pos:pos + length])
+        pos += length
+
+        self.events = []  # (frame, kind, payload)
+        self.keyframes = {}  # frame -> compressed snapshot
+        self.end_frame = None
+        self.end_crc = None
+        while pos < len(data):
+            kind, frame = RECORD.unpack_from(data, pos)
+            pos += RECORD.size
+            if kind == EVENT_BREAK:
+                ring_id, count = BREAK.unpack_from(data, pos)
+                pos += BREAK.size
+                teams = np.frombuffer(data, dtype="<u2", count=count, offset=pos)
+                pos += 2 * count
+                self.events.append((frame, kind, normalize(kind, (ring_id, teams))))
+            elif kind == EVENT_CONTACTS:
+                (count,) = COUNT.unpack_from(data, pos)
+                pos += COUNT.size
+                balls = np.frombuffer(data, dtype="<i4", count=count, offset=pos)
+                rings = np.frombuffer(data, dtype="<i4", count=count, offset=pos + 4 * count)
+                pos += 8 * count
+                self.events.append((frame, kind, normalize(kind, (balls, rings))))
+            elif kind == EVENT_PAUSE:
+                self.events.append((frame, kind, ()))
+            elif kind == RECORD_KEYFRAME:
+                (length,) = COUNT.unpack_from(data, pos)
+                pos += COUNT.size
+                self.keyframes[frame] = data[pos:pos + length]
+                pos += length
+            elif kind == RECORD_END:
+                (self.end_crc,) = COUNT.unpack_from(data, pos)
+                pos += COUNT.size
+                self.end_frame = frame
+            else:
+                raise ValueError(f"Unknown record kind {kind} at byte {pos - RECORD.size}")
+        if self.end_frame is None:
+            # Cut short (e.g. the game was killed): replay what was written
+            self.end_frame = max([e[0] + 1 for e in self.events] + list(self.keyframes))
+
+    def pauses(self):
+        return [frame for frame, kind, _ in self.events if kind == EVENT_PAUSE]
+
+    def snapshot(self, frame):
+        """snapshot.pack() bytes of the keyframe at frame."""
+        return zlib.decompress(self.keyframes[frame])
+
+
+class Verifier:
+    """Stands in for the Recorder during a replay and checks every event against the log."""
+
+    def __init__(self, events):
+        self.events = events
+        self.index = 0
+
+    def event(self, frame, kind, payload):
+        got = (frame, kind, normalize(kind, payload))
+        expected = self.events[self.index] if self.index < len(self.events) else None
+        if got != expected:
+            raise ReplayDivergence(frame, expected, got)
+        self.index += 1
+
+    def stepped(self, sim):
+        pass
+
+    def finish(self, sim):
+        """Check that no logged event was left unreplayed before sim.frame."""
+        if self.index < len(self.events) and self.events[self.index][0] < sim.frame:
+            raise ReplayDivergence(self.events[self.index][0], self.events[self.index], None)
+
+
+class Replayer:
+    """Re-run a logged game headless, as fast as the CPU allows."""
+
+    def __init__(self, log):
+        self.log = log if isinstance(log, ReplayLog) else ReplayLog(log)
+
+    def start(self, frame=0):
+        """A simulation at the last keyframe at or before frame, or built from the seed."""
+        keyframes = [k for k in self.log.keyframes if k <= frame]
+        if keyframes:
+            sim = snapshot.unpack(self.log.snapshot(max(keyframes)))
+        else:
+            config = self.log.config
+            sim = Simulation(config["width"], config["height"], seed=config["seed"], **config["game_options"])
+        return sim
+
+    def run(self, sim, until, verify=True):
+        """Step sim up to frame until, applying logged pauses and checking events."""
+        verifier = None
+        if verify:
+            verifier = Verifier([e for e in self.log.events if e[0] >= sim.frame])
+            sim.recorder = verifier
+        pauses = [f for f in self.log.pauses() if f >= sim.frame]
+        p = 0
+        while sim.frame < until:
+            # A pause toggle logged at frame f happened just before step f
+            while p < len(pauses) and pauses[p] == sim.frame:
+                sim.game.toggle_pause()
+                p += 1
+            sim.step()
+        if verifier is not None:
+            verifier.finish(sim)
+            sim.recorder = None
+        return sim
+
+    def seek(self, frame, exact=False):
+        """The simulation as it was just before step frame.
+
+        By default it starts from the nearest keyframe, which is fast but
+        not exact (see snapshot.dumps), so events are not checked.
+        exact=True replays from the seed and checks every event on the way.
+        """
+        if exact:
+            return self.run(self.start(0), frame)
+        return self.run(self.start(frame), frame, verify=False)
+
+    def verify(self):
+        """Replay the whole log from the seed; raises ReplayDivergence on any mismatch."""
+        config = self.log.config
+        sim = Simulation(config["width"], config["height"], seed=config["seed"], **config["game_options"])
+        self.run(sim, self.log.end_frame)
+        if self.log.end_crc is not None and result_crc(sim) != self.log.end_crc:
+            raise ReplayDivergence(sim.frame, "logged result", sim.result())
+        return sim
+
+
+def record(path, seed=None, seconds=None, keyframe_interval=600, **game_options):
+    """Run a headless game to the end (or for seconds) while recording it."""
+    sim = Simulation(seed=seed, **game_options)
+    recorder = Recorder(path, sim, keyframe_interval)
+    sim.recorder = recorder
+    max_steps = None if seconds is None else int(seconds / sim.fixed_dt)
+    sim.run(max_steps=max_steps)
+    sim.recorder = None
+    recorder.close(sim)
+    return sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record, verify and seek deterministic replays")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record a headless game")
+    rec.add_argument("log")
+    rec.add_argument("--seed", type=int, default=None)
+    rec.add_argument("--seconds", type=float, default=None, help="default: until the countdown ends")
+    rec.add_argument("--balls-per-team", type=int, default=1)
+    rec.add_argument("--keyframe-interval", type=int, default=600)
+    ver = sub.add_parser("verify", help="replay from the seed and check every event")
+    ver.add_argument("log")
+    seek = sub.add_parser("seek", help="jump to a frame through the nearest keyframe")
+    seek.add_argument("log")
+    seek.add_argument("frame", type=int)
+    seek.add_argument("--exact", action="store_true", help="replay from the seed instead of a keyframe")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == "record":
+        sim = record(args.log, args.seed, args.seconds, args.keyframe_interval,
+                     balls_per_team=args.balls_per_team)
+        size = os.path.getsize(args.log)
+        print(f"Recorded {sim.frame} frames (seed {sim.seed}), {size / 1024:.1f} KB", file=sys.stderr)
+    elif args.command == "verify":
+        replayer = Replayer(args.log)
+        try:
+            sim = replayer.verify()
+        except ReplayDivergence as e:
+            print(f"Diverged at {e}", file=sys.stderr)
+            return 1
+        elapsed = time.perf_counter() - start
+        print(f"Replayed {sim.frame} frames without divergence in {elapsed:.2f}s "
+              f"({sim.frame / elapsed:.0f} steps/s)", file=sys.stderr)
+    else:
+        sim = Replayer(args.log).seek(args.frame, args.exact)
+        print(json.dumps(sim.result()))
+        print(f"Reached frame {sim.frame} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
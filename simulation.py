@@ -0,0 +1,166 @@
+import random
+
+from Box2D import b2World
+
+from MyContactListener import MyContactListener
+from game import Game
+from profiler import FrameProfiler
+
+# Independent random streams, so e.g. an extra sound trigger never shifts ring colors
+RNG_STREAMS = ("rings", "balls", "particles", "sounds")
+
+
+class Simulation:
+    """Headless simulation: owns the Box2D world, the clock and the Game state.
+
+    Nothing here touches the display or the mixer, so it can be stepped as
+    fast as the CPU allows. main.py only draws on top of it.
+    """
+
+    def __init__(self, width=540, height=960, sounds=None, profiler=None, seed=None, build_game=True,
+                 **game_options):
+        self.width = width
+        self.height = height
+        self.PPM = 10.0  # Pixels per meter
+        self.game_options = game_options
+
+        # Every random draw comes from a stream seeded from self.seed. Without
+        # a seed one is drawn from `random`, so random.seed() still fixes a run
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng = {name: random.Random(f"{self.seed}:{name}") for name in RNG_STREAMS}
+
+        # Optional replay.Recorder (or Verifier) told about inputs, events and steps
+        self.recorder = None
+
+        # Optional Sounds instance, None when running headless
+        self.sounds = sounds
+        # Section timings; disabled unless a FrameProfiler(enabled=True) is passed
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+
+        self.world = b2World(gravity=(0, -20), doSleep=True)
+        self.contactListener = MyContactListener(self)
+        self.world.contactListener = self.contactListener
+
+        # Fixed-timestep clock: physics, ring motion and the countdown all
+        # advance by fixed_dt, whatever the render frame rate is
+        self.fixed_dt = 1.0 / 60.0
+        self.max_steps_per_frame = 5  # Cap catch-up to avoid the spiral of death
+        self.max_frame_time = 0.25
+        self.accumulator = 0
+        self.alpha = 1.0  # Interpolation factor between the last two steps
+
+        self.dt = self.fixed_dt
+        self.time = 0
+        self.frame = 0
+
+        # Every sound trigger as (time, name, variant), for offline mixdown
+        self.sound_events = []
+
+        # Balls and rings by contact_id, to resolve queued contact events.
+        # Slots of destroyed rings are reused, so the list stays as long as the live bodies
+        self.bodies = []
+        self.free_body_ids = []
+
+        # game_options go to Game, e.g. teams=... and balls_per_team=... for crowd mode.
+        # snapshot.restore builds the game itself (build_game=False)
+        self.game = Game(self, **game_options) if build_game else None
+
+    def to_Pos(self, pos):
+        """Convert from Box2D to Pygame coordinates."""
+        return (pos[0] * self.PPM, self.height - (pos[1] * self.PPM))
+
+    def from_Pos(self, pos):
+        """Convert from Pygame to Box2D coordinates."""
+        return (pos[0] / self.PPM, (self.height - pos[1]) / self.PPM)
+
+    def deltaTime(self):
+        return self.dt
+
+    def config(self):
+        """What it takes to build this simulation again, e.g. for a replay log."""
+        return {"width": self.width, "height": self.height, "seed": self.seed,
+                "game_options": dict(self.game_options)}
+
+    def record(self, kind, *payload):
+        """Report an input or event of the current frame to the recorder, if any."""
+        if self.recorder is not None:
+            self.recorder.event(self.frame, kind, payload)
+
+    def register_body(self, obj):
+        """Give a Ball or RingB the integer id its contact events refer to."""
+        if self.free_body_ids:
+            contact_id = self.free_body_ids.pop()
+            self.bodies[contact_id] = obj
+            return contact_id
+        self.bodies.append(obj)
+        return len(self.bodies) - 1
+
+    def release_body(self, obj):
+        """Free obj's contact_id once its Box2D body is destroyed."""
+        self.bodies[obj.contact_id] = None
+        self.free_body_ids.append(obj.contact_id)
+
+    def trigger_sound(self, name, variant=None):
+        """Log a sound trigger at the current simulation time and play it live."""
+        if variant is None:
+            # Drawn even when headless so live and headless runs stay in step
+            variant = self.rng["sounds"].random() if name == "gravity_fall" else 0.0
+        self.sound_events.append((self.time, name, variant))
+        if self.sounds is not None:
+            self.sounds.play_event(self.time, name, variant)
+
+    def step(self, dt=None):
+        """Advance the game by one physics step (fixed_dt by default)."""
+        self.dt = self.fixed_dt if dt is None else dt
+        self.game.update()
+        self.frame += 1
+        if self.recorder is not None:
+            self.recorder.stepped(self)
+
+    def advance(self, frame_time):
+        """Consume real frame time in fixed steps and return the step count.
+
+        Leftover time stays in the accumulator and sets alpha, which the
+        renderer uses to interpolate between the last two physics states.
+        """
+        self.accumulator += min(frame_time, self.max_frame_time)
+
+        steps = 0
+        while self.accumulator >= self.fixed_dt:
+            if steps >= self.max_steps_per_frame:
+                # Too far behind: drop the backlog instead of catching up
+                self.accumulator = 0
+                break
+            self.game.store_previous_state()
+            self.step()
+            self.accumulator -= self.fixed_dt
+            steps += 1
+
+        self.alpha = self.accumulator / self.fixed_dt
+        return steps
+
+    def is_finished(self):
+        return self.game.timer_current <= 0
+
+    def run(self, dt=None, max_steps=None):
+        """Step until the countdown reaches zero and return the outcome."""
+        steps = 0
+        while not self.is_finished():
+            if max_steps is not None and steps >= max_steps:
+                break
+            self.step(dt)
+            self.profiler.end_frame()  # Headless, every step is a frame
+            steps += 1
+        return self.result()
+
+    def result(self):
+        game = self.game
+        return {
+            "yes_points": game.yes_points,
+            "no_points": game.no_points,
+            "points": dict(game.points),
+            "rings_broken_count": game.rings_broken_count,
+            "break_times": list(game.break_times),
+            "time": self.time,
+            "frames": self.frame,
+        }
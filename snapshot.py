@@ -0,0 +1,207 @@
+import io
+import json
+import pickle
+
+import numpy as np
+from Box2D import b2Filter
+from pygame import Vector2
+
+from Ball import Ball
+from RingB import RingB
+from game import Game
+from particle import ParticleSystem
+from simulation import Simulation
+
+# Live references rebuilt on restore instead of being copied
+SIM_SKIP = {"sounds", "profiler", "recorder", "world", "contactListener", "bodies", "game", "rng"}
+GAME_SKIP = {"sim", "balls", "ball_yes", "ball_no", "rings", "particles", "boxes",
+             "points_layer", "points_layer_key"}
+RING_SKIP = {"sim", "body", "edges"}
+BALL_SKIP = {"sim", "circle_body", "circle_shape"}
+PARTICLE_ARRAYS = ("x", "y", "vel_x", "vel_y", "life", "color", "free")
+
+
+def plain_state(obj, skip):
+    return {k: v for k, v in obj.__dict__.items() if k not in skip}
+
+
+def body_state(body):
+    return (tuple(body.position), body.angle, tuple(body.linearVelocity), body.angularVelocity, body.awake)
+
+
+def set_body_state(body, state):
+    position, angle, velocity, angular_velocity, awake = state
+    body.position = position
+    body.angle = angle
+    body.linearVelocity = velocity
+    body.angularVelocity = angular_velocity
+    body.awake = awake
+
+
+def state_of(sim):
+    """Live view of everything that decides how a Simulation continues.
+
+    Shares the simulation's own lists and arrays: only fit for serializing
+    right away, see dumps(), pack() and capture().
+    """
+    game = sim.game
+    particles = game.particles
+    return {
+        "config": sim.config(),
+        "sim": plain_state(sim, SIM_SKIP),
+        "rng": {name: r.getstate() for name, r in sim.rng.items()},
+        "body_count": len(sim.bodies),
+        "game": plain_state(game, GAME_SKIP),
+        "balls": [(plain_state(ball, BALL_SKIP), body_state(ball.circle_body)) for ball in game.balls],
+        "rings": [(plain_state(ring, RING_SKIP), body_state(ring.body)) for ring in game.rings],
+        "particles": {
+            "arrays": {name: getattr(particles, name) for name in PARTICLE_ARRAYS},
+            "free_count": particles.free_count,
+            "rng": particles.rng.bit_generator.state,
+        },
+    }
+
+
+def dumps(sim):
+    """The simulation state as bytes, the cheapest snapshot to take and to ship to other processes.
+
+    Restores are not bit-exact (pybox2d can't carry Box2D's contact cache),
+    but every world loaded from the same bytes runs identically.
+    """
+    return pickle.dumps(state_of(sim), pickle.HIGHEST_PROTOCOL)
+
+
+def loads(blob, sounds=None, profiler=None):
+    """A new Simulation, with its own Box2D world, continuing from dumps() bytes.
+
+    The same bytes can be loaded any number of times, each into an independent world.
+    """
+    return build(pickle.loads(blob), sounds, profiler)
+
+
+def capture(sim):
+    """Plain-data copy of the simulation state (picklable, e.g. for a replay keyframe)."""
+    return pickle.loads(dumps(sim))
+
+
+def restore(state, sounds=None, profiler=None):
+    """A new Simulation continuing from a capture(); state is left untouched."""
+    return loads(pickle.dumps(state, pickle.HIGHEST_PROTOCOL), sounds, profiler)
+
+
+def pack(sim):
+    """The simulation state as JSON plus NumPy arrays, safe to unpack() from a shared file."""
+    arrays = []
+    tree = json.dumps(to_plain(state_of(sim), arrays)).encode()
+    stream = io.BytesIO()
+    np.savez(stream, np.frombuffer(tree, dtype=np.uint8), *arrays)
+    return stream.getvalue()
+
+
+def unpack(blob, sounds=None, profiler=None):
+    """A new Simulation continuing from pack() bytes."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        tree = json.loads(data["arr_0"].tobytes())
+        arrays = [data[f"arr_{i}"] for i in range(1, len(data.files))]
+    return build(from_plain(tree, arrays), sounds, profiler)
+
+
+def to_plain(value, arrays):
+    """value as JSON types; containers JSON lacks are tagged, arrays are moved to arrays."""
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return {"array": len(arrays) - 1}
+    if isinstance(value, dict):
+        return {"dict": [[to_plain(k, arrays), to_plain(v, arrays)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {"tuple": [to_plain(v, arrays) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {"set": [to_plain(v, arrays) for v in value]}
+    if isinstance(value, Vector2):
+        return {"vector2": [value.x, value.y]}
+    if isinstance(value, list):
+        return [to_plain(v, arrays) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Can't pack {type(value).__name__}")
+
+
+def from_plain(value, arrays):
+    if isinstance(value, list):
+        return [from_plain(v, arrays) for v in value]
+    if not isinstance(value, dict):
+        return value
+    (tag, items), = value.items()
+    if tag == "array":
+        return arrays[items]
+    if tag == "vector2":
+        return Vector2(items)
+    items = [from_plain(v, arrays) for v in items]
+    if tag == "dict":
+        return {k: v for k, v in items}
+    if tag == "tuple":
+        return tuple(items)
+    if tag == "set":
+        return set(items)
+    raise ValueError(f"Unknown tag {tag!r} in packed state")
+
+
+def build(state, sounds=None, profiler=None):
+    """Rebuild a Simulation from state, taking ownership of its objects."""
+    config = state["config"]
+    sim = Simulation(config["width"], config["height"], sounds=sounds, profiler=profiler,
+                     seed=config["seed"], build_game=False,
+                     **config["game_options"])
+    sim.__dict__.update(state["sim"])
+    for name, rng_state in state["rng"].items():
+        sim.rng[name].setstate(rng_state)
+    sim.bodies = [None] * state["body_count"]
+
+    game = Game.__new__(Game)
+    game.__dict__.update(state["game"])
+    game.sim = sim
+    game.boxes = []
+    game.points_layer_key = None
+    game.points_layer = None
+    sim.game = game
+
+    # Same creation order as a live run: balls first, then rings inside out
+    game.balls = [restore_ball(sim, data, body) for data, body in state["balls"]]
+    game.ball_yes = next((ball for ball in game.balls if ball.text == "Yes"), None)
+    game.ball_no = next((ball for ball in game.balls if ball.text == "No"), None)
+    game.rings = [restore_ring(sim, data, body) for data, body in state["rings"]]
+
+    particles = state["particles"]
+    game.particles = ParticleSystem(capacity=0)
+    for name, array in particles["arrays"].items():
+        setattr(game.particles, name, array)
+    game.particles.capacity = len(game.particles.x)
+    game.particles.free_count = particles["free_count"]
+    game.particles.rng.bit_generator.state = particles["rng"]
+    return sim
+
+
+def restore_ball(sim, data, body):
+    ball = Ball.__new__(Ball)
+    ball.__dict__.update(data)
+    ball.sim = sim
+    ball.circle_body = sim.world.CreateDynamicBody(position=body[0])
+    ball.circle_shape = ball.circle_body.CreateCircleFixture(radius=ball.radius, density=1, friction=0.0,
+                                                             restitution=1.01, filter=b2Filter(groupIndex=ball.group))
+    set_body_state(ball.circle_body, body)
+    ball.circle_body.userData = ball
+    sim.bodies[ball.contact_id] = ball
+    return ball
+
+
+def restore_ring(sim, data, body):
+    ring = RingB.__new__(RingB)
+    ring.__dict__.update(data)
+    ring.sim = sim
+    ring.body = sim.world.CreateKinematicBody(position=body[0], angle=body[1])
+    ring.edges = []
+    ring.create_edge_shape()  # From the current (shrunk) vertices
+    set_body_state(ring.body, body)
+    ring.body.userData = ring
+    sim.bodies[ring.contact_id] = ring
+    return ring
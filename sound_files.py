@@ -0,0 +1,41 @@
+import os
+
+ASSETS_DIR = "assets"
+
+# Sound event name -> asset file
+SOUND_FILES = {
+    "destroy": "assets/none.wav",  # General destroy sound (legacy)
+    "yes": "assets/YES.wav",
+    "no": "assets/NO.wav",
+}
+
+_listing = None  # File names in ASSETS_DIR, listed once
+
+
+def asset_names():
+    """Names of the files in assets/, read from disk only the first time."""
+    global _listing
+    if _listing is None:
+        try:
+            _listing = frozenset(os.listdir(ASSETS_DIR))
+        except FileNotFoundError:
+            _listing = frozenset()
+    return _listing
+
+
+def gravity_fall_files():
+    """Paths of the Gravity Falls clips played when a ball touches a ring."""
+    names = asset_names()
+    files = []
+
+    # First the base file
+    if "gravity fall.wav" in names:
+        files.append(f"{ASSETS_DIR}/gravity fall.wav")
+
+    # Then numbered files (2-15), "gravity fall (2).wav" or "gravity fall2.wav"
+    for i in range(2, 16):
+        for name in (f"gravity fall ({i}).wav", f"gravity fall{i}.wav"):
+            if name in names:
+                files.append(f"{ASSETS_DIR}/{name}")
+                break  # Found a valid file for this number, move to next
+    return files
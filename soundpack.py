@@ -0,0 +1,181 @@
+import argparse
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from mixdown import read_wav, resample
+from sound_files import ASSETS_DIR, asset_names
+
+PACK_FILE = "assets/sounds.pack"
+MAGIC = b"BBSPACK1"
+
+# magic, rate, channels, clip count, offset of the PCM data
+HEADER = struct.Struct("<8sIIII")
+# offset from the data start, byte length, name length (the utf-8 name follows)
+ENTRY = struct.Struct("<QQH")
+ALIGN = 4096
+
+
+def pack_sources():
+    """Every WAV under assets/, as the paths Sounds asks for."""
+    return [f"{ASSETS_DIR}/{name}" for name in sorted(asset_names()) if name.lower().endswith(".wav")]
+
+
+def build_pack(paths, out=PACK_FILE, rate=44100, channels=2):
+    """Decode, resample and convert clips to signed 16-bit PCM in one file.
+
+    The PCM is already in the mixer's format, so at runtime a clip is just a
+    slice of the memory-mapped file.
+    """
+    blobs = []
+    for path in paths:
+        try:
+            data, src_rate = read_wav(path)
+        except (ValueError, EOFError, OSError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+            continue
+        data = resample(data, src_rate, rate)
+        if data.shape[1] != channels:
+            data = np.repeat(data.mean(axis=1, keepdims=True), channels, axis=1)
+        pcm = (np.clip(data, -1.0, 1.0) * 32767.0).astype("<i2")
+        blobs.append((path.encode("utf-8"), pcm.tobytes()))
+
+    index = bytearray()
+    offset = 0
+    for name, blob in blobs:
+        index += ENTRY.pack(offset, len(blob), len(name)) + name
+        offset += len(blob) + (-len(blob)) % 4  # Keep every clip frame-aligned
+
+    data_start = HEADER.size + len(index)
+    data_start += (-data_start) % ALIGN
+    with open(out, "wb") as f:
+        f.write(HEADER.pack(MAGIC, rate, channels, len(blobs), data_start))
+        f.write(index)
+        f.seek(data_start)
+        for name, blob in blobs:
+            f.write(blob)
+            f.write(bytes((-len(blob)) % 4))
+    return len(blobs), data_start + offset
+
+
+class SoundPack:
+    """Read-only, memory-mapped view of a file written by build_pack."""
+
+    def __init__(self, path=PACK_FILE):
+        with open(path, "rb") as f:
+            # The map keeps its own reference, so the file handle can be closed
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.rate, self.channels, count, data_start = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a sound pack")
+
+        self.view = memoryview(self.map)
+        self.index = {}  # path -> (start, stop) in the map
+        pos = HEADER.size
+        for _ in range(count):
+            offset, length, name_length = ENTRY.unpack_from(self.map, pos)
+            pos += ENTRY.size
+            name = bytes(self.map[pos:pos + name_length]).decode("utf-8")
+            pos += name_length
+            self.index[name] = (data_start + offset, data_start + offset + length)
+
+    def matches(self, mixer_init):
+        """True if the PCM is in the format returned by pygame.mixer.get_init()."""
+        return mixer_init == (self.rate, -16, self.channels)
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def pcm(self, path):
+        start, stop = self.index[path]
+        return self.view[start:stop]
+
+    def sound(self, path):
+        import pygame
+        return pygame.mixer.Sound(buffer=self.pcm(path))
+
+
+def load_pack(mixer_init, path=PACK_FILE):
+    """The pack if it exists and matches the mixer format, else None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        pack = SoundPack(path)
+    except (ValueError, OSError, struct.error) as e:
+        print(f"Warning: ignoring {path}: {e}")
+        return None
+    if not pack.matches(mixer_init):
+        print(f"Warning: {path} is {pack.rate} Hz/{pack.channels} ch, "
+              f"mixer is {mixer_init}; loading loose WAVs")
+        return None
+    return pack
+
+
+def resident_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def bench_one(mode):
+    """Load every pack source once, in this process, and print a result line."""
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    pygame.mixer.init()
+    paths = pack_sources()
+    rss = resident_kb()
+
+    start = time.perf_counter()
+    if mode == "pack":
+        pack = load_pack(pygame.mixer.get_init())
+        if pack is None:
+            raise SystemExit(f"No usable {PACK_FILE}, run: python soundpack.py build")
+        clips = [pack.sound(p) for p in paths if p in pack]
+    else:
+        clips = []
+        for p in paths:
+            try:
+                clips.append(pygame.mixer.Sound(p))
+            except pygame.error:
+                pass
+    elapsed = time.perf_counter() - start
+
+    fds = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else -1
+    print(f"{mode}: {len(clips)} clips in {elapsed * 1000:.1f} ms, "
+          f"+{(resident_kb() - rss) / 1024:.1f} MB resident, {fds} open fds")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or benchmark the pre-decoded sound pack")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="pack every assets/*.wav")
+    build.add_argument("-o", "--out", default=PACK_FILE)
+    build.add_argument("--rate", type=int, default=44100)
+    build.add_argument("--channels", type=int, default=2)
+    bench = sub.add_parser("bench", help="compare the pack with loose WAVs")
+    bench.add_argument("--mode", choices=("pack", "wav"), default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        count, size = build_pack(pack_sources(), args.out, args.rate, args.channels)
+        print(f"Packed {count} clips, {size / 2 ** 20:.1f} MB, "
+              f"in {time.perf_counter() - start:.2f}s to {args.out}")
+    elif args.mode:
+        bench_one(args.mode)
+    else:
+        # Each mode in a fresh process so memory and handles don't mix
+        for mode in ("wav", "pack"):
+            subprocess.run([sys.executable, __file__, "bench", "--mode", mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
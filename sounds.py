@@ -1,87 +1,267 @@
+from concurrent.futures import ThreadPoolExecutor
 from pygame import mixer
 import pygame
 import random
-import os
+
+from sound_files import SOUND_FILES, gravity_fall_files
+
+
+class SoundBank:
+    """Decode clips on background threads and hand them out once ready.
+
+    get() never blocks: until a clip is decoded (or if it failed to load)
+    it returns a silent placeholder, so startup doesn't wait on audio.
+    Clips found in the pre-decoded pack (soundpack.py) skip the threads.
+    """
+
+    def __init__(self, workers=4, pack=None):
+        self.pack = pack
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sound")
+        self.futures = {}  # path -> Future of a pygame Sound
+        self.clips = {}  # path -> Sound, filled in by get() as futures complete
+        self.silence = pygame.mixer.Sound(buffer=bytes(4))
+
+    def preload(self, paths):
+        for path in paths:
+            if self.pack is not None and path in self.pack:
+                continue  # Nothing to decode, get() slices it out of the pack
+            if path not in self.futures:
+                self.futures[path] = self.executor.submit(pygame.mixer.Sound, path)
+
+    def get(self, path):
+        clip = self.clips.get(path)
+        if clip is not None:
+            return clip
+
+        if self.pack is not None and path in self.pack:
+            clip = self.pack.sound(path)
+            self.clips[path] = clip
+            return clip
+
+        future = self.futures.get(path)
+        if future is None:
+            self.preload([path])
+            return self.silence
+        if not future.done():
+            return self.silence
+
+        try:
+            clip = future.result()
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Warning: could not load {path}: {e}")
+            clip = self.silence
+        self.clips[path] = clip
+        return clip
+
+    def ready(self):
+        return all(future.done() for future in self.futures.values())
+
+    def wait(self):
+        """Block until every requested clip is decoded (e.g. before recording)."""
+        for future in list(self.futures.values()):
+            future.exception()
+
+
+# name -> (priority, retrigger cooldown in simulation seconds, exclusive)
+# Higher priority voices can steal lower ones. An exclusive sound cuts its
+# own previous voice instead of stacking, like the Gravity Falls songs always did.
+# Channels playing something started outside the scheduler (e.g. Sounds.play)
+# count as UNOWNED, below every rule.
+UNOWNED = (-1, None, 0.0)
+VOICE_RULES = {
+    "yes": (2, 0.05, False),
+    "no": (2, 0.05, False),
+    "destroy": (2, 0.05, False),
+    "gravity_fall": (1, 0.1, True),
+}
+
+
+VOICES = 8
+
+
+class VoiceScheduler:
+    """Fixed budget of mixer channels shared by all sound triggers.
+
+    trigger() only queues; flush() once per rendered frame starts the
+    queued sounds. Every decision goes by the simulation time of the
+    trigger, never the wall clock, so mixdown.py's offline mix of the
+    logged triggers comes out the same as live play.
+    """
+
+    def __init__(self, voices=VOICES, rules=VOICE_RULES, channels=None):
+        self.rules = rules
+        if channels is None:
+            mixer.set_num_channels(voices)
+            channels = [mixer.Channel(i) for i in range(voices)]
+        self.channels = channels
+        self.owners = [None] * len(channels)  # (priority, name, start time) of each channel's voice
+        self.pending = {}  # (time, name) -> Sound, until the next flush
+        self.last_start = {}  # name -> time it last started
+
+        self.played = 0
+        self.coalesced = 0  # Triggers merged into another one at the same time
+        self.cooled = 0  # Dropped because the same sound just started
+        self.stolen = 0  # Voices cut short to make room
+        self.dropped = 0  # No free voice and nothing of lower priority to steal
+
+    def trigger(self, name, sound, time):
+        """Queue sound for name, triggered at simulation time."""
+        if (time, name) in self.pending:
+            self.coalesced += 1
+        self.pending[(time, name)] = sound  # The last trigger of the step wins
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        # In trigger order; at the same time, most important first so they get the free voices
+        queued = sorted(self.pending.items(), key=lambda item: (item[0][0], -self.rules[item[0][1]][0]))
+        self.pending.clear()
+        for (now, name), sound in queued:
+            priority, cooldown, exclusive = self.rules[name]
+            if now - self.last_start.get(name, -cooldown) < cooldown:
+                self.cooled += 1
+                continue
+
+            i = self.pick_channel(name, priority, exclusive, now)
+            if i is None:
+                self.dropped += 1
+                continue
+            self.start(i, sound, now)
+            self.owners[i] = (priority, name, now)
+            self.last_start[name] = now
+            self.played += 1
+
+    def busy(self, i, now):
+        """Whether channel i is still playing at time now."""
+        return self.channels[i].get_busy()
+
+    def start(self, i, sound, now):
+        self.channels[i].play(sound)
+
+    def pick_channel(self, name, priority, exclusive, now):
+        if exclusive:
+            for i, owner in enumerate(self.owners):
+                if owner is not None and owner[1] == name and self.busy(i, now):
+                    return i  # Cut our own previous voice
+
+        for i in range(len(self.channels)):
+            if not self.busy(i, now):
+                return i
+
+        # Steal the oldest of the lowest-priority voices, if below ours
+        owners = [owner or UNOWNED for owner in self.owners]
+        victim = min(range(len(owners)), key=lambda i: (owners[i][0], owners[i][2]))
+        if owners[victim][0] < priority:
+            self.stolen += 1
+            return victim
+        return None
+
+    def stats(self):
+        """Trigger counters, printed on exit when profiling."""
+        return {
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "cooled": self.cooled,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+        }
+
 
 class Sounds:
-    def __init__(self):
-        mixer.init()
+    """Sound effects played live; the mixer and bank start on first use."""
+
+    def __init__(self, voices=VOICES):
+        self._bank = None
+        self.voices = None
+        self.voice_count = voices
+        self.rng = random.Random()  # Only for songs picked without a variant
+
+        # Gravity Falls songs for touch events
+        self.gravity_fall_songs = gravity_fall_files()
 
-        # General destroy sound (legacy)
-        self.destroySound = pygame.mixer.Sound("assets/none.wav")
-        
-        # New sounds for yes/no balls
-        self.yes_sound = pygame.mixer.Sound("assets/YES.wav")
-        self.no_sound = pygame.mixer.Sound("assets/NO.wav")
-        
-        # Load all Gravity Falls songs for touch events
-        self.gravity_fall_songs = []
-        
-        # First try to load the base file
-        base_file = "assets/gravity fall.wav"
-        if os.path.exists(base_file):
-            self.gravity_fall_songs.append(pygame.mixer.Sound(base_file))
-        
-        # Then try to load numbered files (1-15)
-        for i in range(2, 16):  # Start from 2 since "gravity fall.wav" is already loaded
-            # Try both formats of the filename
-            file_patterns = [
-                f"assets/gravity fall ({i}).wav",  # Format: "gravity fall (2).wav"
-                f"assets/gravity fall{i}.wav"      # Format: "gravity fall2.wav"
-            ]
-            
-            for file_path in file_patterns:
-                if os.path.exists(file_path):
-                    self.gravity_fall_songs.append(pygame.mixer.Sound(file_path))
-                    break  # Found a valid file for this number, move to next
-        
-        # Print status message
-        print(f"Loaded {len(self.gravity_fall_songs)} gravity fall songs")
-                
         # If no gravity fall songs were found, add a placeholder
         if not self.gravity_fall_songs:
             print("Warning: No gravity fall songs found. Using placeholder.")
-            self.gravity_fall_songs = [self.destroySound]
+            self.gravity_fall_songs = [SOUND_FILES["destroy"]]
 
         # Extract note segments
         self.segments = [
-            pygame.mixer.Sound("assets/none.wav"),
+            "assets/none.wav",
         ]
         self.i = 0
-        
-        # Track currently playing song to avoid overlap
-        self.current_playing_song = None
+
+    @property
+    def bank(self):
+        if self._bank is None:
+            self.start()
+        return self._bank
+
+    def start(self):
+        """Open the mixer and start decoding in the background, if not done yet."""
+        if self._bank is not None:
+            return
+        from soundpack import load_pack  # soundpack decodes through mixdown, which imports this module
+        mixer.init()
+        self._bank = SoundBank(pack=load_pack(mixer.get_init()))
+        self.voices = VoiceScheduler(self.voice_count)
+
+        # Break sounds first, they are the ones heard in the first seconds
+        self._bank.preload([SOUND_FILES["yes"], SOUND_FILES["no"], SOUND_FILES["destroy"]])
+        self._bank.preload(self.gravity_fall_songs)
 
     def play(self):
         for s in self.segments:
-            s.stop()
-        sound = self.segments[self.i]
+            self.bank.get(s).stop()
+        sound = self.bank.get(self.segments[self.i])
         sound.play()
         self.i += 1
         if self.i >= len(self.segments):
             self.i = 0
 
-    def playDestroySound(self):
-        self.destroySound.play()
-        
-    def playYesSound(self):
+    def trigger(self, name, path, time):
+        sound = self.bank.get(path)  # Starts the mixer and voices if needed
+        self.voices.trigger(name, sound, time)
+
+    def flush(self):
+        """Start this frame's queued sounds; call once per rendered frame."""
+        if self.voices is not None:
+            self.voices.flush()
+
+    def playDestroySound(self, time):
+        self.trigger("destroy", SOUND_FILES["destroy"], time)
+
+    def playYesSound(self, time):
         """Play sound when Yes ball breaks a ring"""
-        self.yes_sound.play()
-        
-    def playNoSound(self):
+        self.trigger("yes", SOUND_FILES["yes"], time)
+
+    def playNoSound(self, time):
         """Play sound when No ball breaks a ring"""
-        self.no_sound.play()
-        
-    def playRandomGravityFallSong(self):
-        """Play a random Gravity Fall song when a ball touches a ring without breaking"""
-        # Stop currently playing song if there is one
-        if self.current_playing_song:
-            self.current_playing_song.stop()
-            
+        self.trigger("no", SOUND_FILES["no"], time)
+
+    def playRandomGravityFallSong(self, time, variant=None):
+        """Play a random Gravity Fall song when a ball touches a ring without breaking
+
+        variant in [0, 1) picks the song, so a logged trigger replays the same one.
+        The new song replaces the one still playing (see VOICE_RULES).
+        """
         # Pick a random song from the collection
-        if self.gravity_fall_songs:
-            self.current_playing_song = random.choice(self.gravity_fall_songs)
-            self.current_playing_song.play()
+        if variant is None:
+            path = self.rng.choice(self.gravity_fall_songs)
+        else:
+            path = self.gravity_fall_songs[int(variant * len(self.gravity_fall_songs))]
+        self.trigger("gravity_fall", path, time)
+
+    def play_event(self, time, name, variant=0.0):
+        """Play a sound event logged by Simulation.trigger_sound"""
+        if name == "yes":
+            self.playYesSound(time)
+        elif name == "no":
+            self.playNoSound(time)
+        elif name == "destroy":
+            self.playDestroySound(time)
+        elif name == "gravity_fall":
+            self.playRandomGravityFallSong(time, variant)
 
 
-sounds = Sounds()
\ No newline at end of file
+sounds = Sounds()  # Shared sound bank, the mixer opens on first use
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    """Bounded LRU cache of pre-rendered surfaces.
+
+    get() returns the surface stored under key, building it with factory()
+    on a miss and evicting the least recently used entry when full.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, factory):
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = factory()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+def make_circle(color, radius):
+    """Filled circle (RGB or RGBA color) centered on a 2*radius square."""
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (radius, radius), radius)
+    return surface
+
+
+sprite_cache = SpriteCache()  # shared by every ball
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def measure():
+    """Time each startup stage of main.py in this (fresh) process, in order."""
+    stages = []
+    last = time.perf_counter()
+
+    def mark(name):
+        nonlocal last
+        now = time.perf_counter()
+        stages.append((name, now - last))
+        last = now
+
+    import pygame
+    mark("import pygame")
+    import Box2D
+    import numpy
+    mark("import Box2D, numpy")
+    from simulation import Simulation
+    mark("import simulation")
+    from util import utils
+    from sounds import sounds
+    mark("import util, sounds")
+
+    sounds.start()
+    mark("mixer + sound bank")
+    screen = utils.screen
+    mark("display")
+    sim = Simulation(utils.width, utils.height, sounds=sounds)
+    mark("world + game")
+    sim.advance(1 / 60)
+    mark("first step")
+    screen.fill((0, 0, 0))
+    sim.game.draw(screen, sim.alpha)
+    mark("first draw (fonts, sprites)")
+    pygame.display.flip()
+    mark("flip")
+    return stages
+
+
+def run_child():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    stages = measure()
+    print(json.dumps(stages))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time and time-to-first-frame, per subsystem")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child()
+        return
+
+    totals = {}
+    order = []
+    walls = []
+    for _ in range(args.runs):
+        # A fresh interpreter each time, so nothing is already imported or cached
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, __file__, "--child"], check=True,
+                             capture_output=True, text=True).stdout
+        walls.append(time.perf_counter() - start)
+        stages = json.loads(out.strip().splitlines()[-1])
+        for name, seconds in stages:
+            if name not in totals:
+                order.append(name)
+                totals[name] = []
+            totals[name].append(seconds)
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    print(f"{'stage':<30}{'median ms':>10}")
+    for name in order:
+        print(f"{name:<30}{median(totals[name]) * 1000:>10.1f}")
+    first_frame = sum(median(totals[name]) for name in order)
+    print(f"{'time to first frame':<30}{first_frame * 1000:>10.1f}")
+    print(f"{'process wall (incl. python)':<30}{median(walls) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
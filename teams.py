@@ -0,0 +1,40 @@
+import colorsys
+import zlib
+
+# Label -> ball color, ring pulse colors, score background and break sound
+TEAMS = {
+    "Yes": {
+        "color": (0, 255, 0),
+        "pulse_colors": [(68, 122, 52), (33, 180, 43), (34, 255, 0)],  # Green pulse for Yes ball
+        "score_bg": (30, 60, 30),
+        "sound": "yes",
+    },
+    "No": {
+        "color": (255, 0, 0),
+        "pulse_colors": [(122, 52, 52), (180, 43, 33), (255, 0, 0)],  # Red pulse for No ball
+        "score_bg": (60, 30, 30),
+        "sound": "no",
+    },
+}
+
+
+def scale_color(color, factor):
+    return tuple(int(c * factor) for c in color)
+
+
+def get_team(label):
+    """Table entry for a team; labels not in TEAMS get one derived from the name."""
+    team = TEAMS.get(label)
+    if team is None:
+        # Stable hue per label so a team keeps its color across runs
+        hue = (zlib.crc32(label.encode()) % 360) / 360.0
+        r, g, b = colorsys.hsv_to_rgb(hue, 1, 1)
+        color = (int(r * 255), int(g * 255), int(b * 255))
+        team = {
+            "color": color,
+            "pulse_colors": [scale_color(color, 0.48), scale_color(color, 0.7), color],
+            "score_bg": scale_color(color, 0.24),
+            "sound": None,  # Only Yes/No have break sounds
+        }
+        TEAMS[label] = team
+    return team
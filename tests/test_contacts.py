@@ -0,0 +1,26 @@
+from MyContactListener import CONTACT_EVENT
+from simulation import Simulation
+
+
+def test_broken_rings_release_their_body_slots():
+    sim = Simulation(seed=2)
+    live = len(sim.game.balls) + len(sim.game.rings)
+    sim.run(max_steps=1800)
+    assert sim.game.rings_broken_count > 50
+    assert len(sim.bodies) <= live + 1
+    registered = [obj for obj in sim.bodies if obj is not None]
+    assert all(not getattr(obj, "destroyFlag", False) for obj in registered)
+    for obj in sim.game.balls + sim.game.rings:
+        assert sim.bodies[obj.contact_id] is obj
+
+
+def test_contact_events_carry_ball_speed():
+    assert "speed" in CONTACT_EVENT.names
+    sim = Simulation(seed=2)
+    for _ in range(120):
+        sim.world.Step(sim.fixed_dt, 6, 2)
+        events = sim.contactListener.drain()
+        if len(events):
+            assert (events["speed"] > 0).all()
+            return
+    raise AssertionError("no ball/ring contact in 2 seconds")
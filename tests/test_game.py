@@ -0,0 +1,40 @@
+from game import CROWD_TRAIL_BALLS_PER_TEAM, TRAIL_LENGTH
+from simulation import Simulation
+
+
+def test_classic_balls_have_trails():
+    sim = Simulation(seed=1)
+    assert all(ball.trail_length == TRAIL_LENGTH for ball in sim.game.balls)
+
+
+def test_crowd_balls_skip_trails_by_default():
+    sim = Simulation(seed=1, balls_per_team=CROWD_TRAIL_BALLS_PER_TEAM + 1)
+    assert all(ball.trail_length == 0 for ball in sim.game.balls)
+    sim.run(max_steps=10)
+    assert all(len(ball.trail) == 0 for ball in sim.game.balls)
+
+
+def test_crowd_trails_can_be_turned_back_on():
+    sim = Simulation(seed=1, balls_per_team=50, trail_length=10)
+    assert all(ball.trail_length == 10 for ball in sim.game.balls)
+
+
+def test_crowd_stragglers_break_rings_without_scoring():
+    sim = Simulation(seed=1, balls_per_team=2)
+    game = sim.game
+    game.timer_current = 50.0  # Past the first 5 s, breaks score
+    cx, cy = game.rings[0].body.position
+    for ball in game.balls:
+        ball.circle_body.position = (cx, cy)
+        ball.circle_body.linearVelocity = (0, 0)
+    sim.step()
+    assert game.rings_broken_count == 0
+
+    # A Yes ball jumps past the first four rings: it crossed ring 1 this
+    # step and scores it, then leaves rings 2-4 behind without scoring them
+    game.balls[0].circle_body.position = (cx + 4.85, cy)
+    game.balls[0].circle_body.linearVelocity = (0, 0)
+    for _ in range(4):
+        sim.step()
+    assert game.rings_broken_count == 4
+    assert game.points == {"Yes": 1, "No": 0}
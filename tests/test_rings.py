@@ -0,0 +1,41 @@
+import pytest
+
+from RingB import sync_ring_bodies
+from simulation import Simulation
+
+
+def thaw_outer_ring(ball_distance):
+    """Freeze the outer ring out of step with its body, then thaw it with a ball at ball_distance from its center."""
+    sim = Simulation(seed=1)
+    ring = sim.game.rings[-1]
+    ball = sim.game.balls[0]
+    ring.body.angularVelocity = 0
+    ring.frozen = True
+    ring.angle = ring.body.angle + 1.0  # RingB.update kept turning it
+    body_angle = ring.body.angle
+    cx, cy = ring.body.position
+    ball.circle_body.position = (cx + ball_distance(ring, ball), cy)
+    ball.circle_body.linearVelocity = (0, 0)
+    sync_ring_bodies([ring], [ball], sim.fixed_dt)
+    assert not ring.frozen
+    return ring, body_angle
+
+
+def test_thaw_snaps_the_body_to_the_drawn_ring():
+    ring, body_angle = thaw_outer_ring(lambda ring, ball: ring.radius - 1.5 * ball.radius)
+    assert ring.body.angle == pytest.approx(body_angle + 1.0)
+
+
+def test_thaw_never_swings_edges_into_a_ball():
+    ring, body_angle = thaw_outer_ring(lambda ring, ball: ring.radius)
+    assert ring.body.angle == body_angle
+    assert ring.angle == body_angle
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rings_keep_breaking_until_the_countdown_ends(seed):
+    sim = Simulation(seed=seed)
+    countdown = sim.game.timer_current
+    result = sim.run()
+    # Balls trapped in a ring that shrank too far stop the breaks early
+    assert result["break_times"][-1] > countdown - 8
@@ -0,0 +1,15 @@
+import montecarlo
+from simulation import Simulation
+
+
+def test_montecarlo_seed_matches_simulation_seed():
+    result = montecarlo.run_one(10)
+    expected = Simulation(seed=10).run()
+    for key in ("yes_points", "no_points", "rings_broken_count", "frames"):
+        assert result[key] == expected[key]
+
+
+def test_seed_zero_is_reproducible():
+    a = Simulation(seed=0)
+    b = Simulation(seed=0)
+    assert a.run(max_steps=600) == b.run(max_steps=600)
@@ -0,0 +1,46 @@
+import io
+
+import numpy as np
+
+import snapshot
+from simulation import Simulation
+
+
+def same(a, b):
+    if isinstance(a, np.ndarray):
+        return np.array_equal(a, b)
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def test_worlds_loaded_from_the_same_bytes_run_identically():
+    sim = Simulation(seed=3, balls_per_team=5)
+    sim.run(max_steps=700)
+    blob = snapshot.dumps(sim)
+    a = snapshot.loads(blob)
+    b = snapshot.loads(blob)
+    assert a.run(max_steps=900) == b.run(max_steps=900)
+    assert [tuple(ball.circle_body.position) for ball in a.game.balls] == \
+           [tuple(ball.circle_body.position) for ball in b.game.balls]
+
+
+def test_restore_keeps_the_captured_state():
+    sim = Simulation(seed=4)
+    sim.run(max_steps=500)
+    state = snapshot.capture(sim)
+    restored = snapshot.restore(state)
+    assert same(snapshot.capture(restored), state)
+    assert restored.result() == sim.result()
+
+
+def test_pack_holds_only_plain_data():
+    sim = Simulation(seed=5, balls_per_team=3)
+    sim.run(max_steps=400)
+    blob = snapshot.pack(sim)
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        assert all(data[name].dtype != object for name in data.files)
+    assert same(snapshot.capture(snapshot.unpack(blob)), snapshot.capture(sim))
+    assert snapshot.unpack(blob).run(max_steps=600) == snapshot.loads(snapshot.dumps(sim)).run(max_steps=600)
@@ -0,0 +1,54 @@
+import numpy as np
+import pygame
+import pytest
+from pygame import mixer
+
+from mixdown import TimelineVoices
+from sounds import VoiceScheduler
+
+
+@pytest.fixture
+def scheduler():
+    mixer.init(44100, -16, 2)
+    yield VoiceScheduler(voices=2)
+    mixer.quit()
+
+
+def tone(seconds=1.0):
+    return pygame.sndarray.make_sound(np.zeros((int(44100 * seconds), 2), dtype=np.int16))
+
+
+def test_steals_channels_started_outside_the_scheduler(scheduler):
+    # Both voices busy with sounds the scheduler never saw (owner None)
+    for channel in scheduler.channels:
+        channel.play(tone())
+    assert scheduler.owners == [None, None]
+
+    scheduler.trigger("yes", tone(), 0.0)
+    scheduler.flush()
+    assert scheduler.played == 1
+    assert scheduler.stolen == 1
+    assert any(owner is not None and owner[1] == "yes" for owner in scheduler.owners)
+
+
+def test_drops_when_every_voice_outranks_the_trigger(scheduler):
+    scheduler.trigger("yes", tone(), 0.0)
+    scheduler.trigger("no", tone(), 0.0)
+    scheduler.flush()
+    scheduler.trigger("gravity_fall", tone(), 0.5)
+    scheduler.flush()
+    assert scheduler.stats()["dropped"] == 1
+
+
+def test_timeline_applies_the_live_rules_on_sim_time():
+    voices = TimelineVoices(rate=100, voices=2)
+    clip = np.zeros((100, 2), dtype=np.float32)  # One second
+    voices.trigger("gravity_fall", clip, 0.0)
+    voices.trigger("gravity_fall", clip, 0.0)  # Coalesced
+    voices.trigger("gravity_fall", clip, 0.05)  # Within the 0.1 s cooldown
+    voices.trigger("gravity_fall", clip, 0.5)  # Cuts its own previous voice
+    voices.trigger("yes", clip, 0.6)
+    voices.trigger("no", clip, 0.6)  # Steals the gravity-fall voice
+    voices.flush()
+    assert voices.stats() == {"played": 4, "coalesced": 1, "cooled": 1, "stolen": 1, "dropped": 0}
+    assert [span[:2] for span in voices.spans] == [[0, 50], [50, 60], [60, 160], [60, 160]]
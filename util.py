@@ -1,55 +1,77 @@
 import colorsys
 import pygame
 import math
-from Box2D import b2World
 from pygame.locals import *
 from pygame import Vector2, mixer, time
-from MyContactListener import MyContactListener
 
-class Utils:
-    def __init__(self):
-        pygame.init()
-        
-        # Obtenir les dimensions de l'écran
-        info = pygame.display.Info()
-        screen_height = info.current_h - 100  # Laisser un peu d'espace pour la barre de tâches/menu
-        
-        # Calculer la largeur proportionnelle (ratio 2:3)
-        self.height = screen_height
-        self.width = int(screen_height * (9/16))
-
-        self.screen = pygame.display.set_mode((self.width, self.height), DOUBLEBUF, 16)
-        self.dt = 0
-        self.clock = pygame.time.Clock()
+from fonts import PIXEL_FONT, get_font, render_text
 
-        self.currentScreen = None
+class Utils:
+    """Window, clock and fonts, each set up the first time it is used.
 
-        self.font8 = pygame.font.Font('assets/pixel.ttf', 8)
-        self.font12 = pygame.font.Font('assets/pixel.ttf', 12)
-        self.font16 = pygame.font.Font('assets/pixel.ttf', 16)
-        self.font32 = pygame.font.Font('assets/pixel.ttf', 32)
+    Importing util is cheap, so tools that only need the physics never open
+    a window.
+    """
 
-        self.world = b2World(gravity=(0, -20), doSleep=True)
-        self.contactListener = MyContactListener()
-        self.world.contactListener = self.contactListener
+    def __init__(self):
+        self._screen = None
+        self._size = None
+        self._clock = None
 
-        self.PPM = 10.0  # Pixels per meter
+        self.dt = 0
+        self.currentScreen = None
 
         self.fps = 0
         self.fpsCounter = 0
         self.fpsTimeCount = 0
-        self.time = 0
 
-    # Le reste du code reste inchangé...
+    def _window_size(self):
+        if self._size is None:
+            pygame.display.init()
+
+            # Obtenir les dimensions de l'écran
+            info = pygame.display.Info()
+            screen_height = info.current_h - 100  # Laisser un peu d'espace pour la barre de tâches/menu
+
+            # Calculer la largeur proportionnelle (ratio 2:3)
+            self._size = (int(screen_height * (9/16)), screen_height)
+        return self._size
+
+    @property
+    def width(self):
+        return self._window_size()[0]
+
+    @property
+    def height(self):
+        return self._window_size()[1]
+
+    @property
+    def screen(self):
+        if self._screen is None:
+            self._screen = pygame.display.set_mode(self._window_size(), DOUBLEBUF, 16)
+        return self._screen
+
+    @property
+    def clock(self):
+        if self._clock is None:
+            self._clock = pygame.time.Clock()
+        return self._clock
+
+    @property
+    def font8(self):
+        return get_font(PIXEL_FONT, 8)
 
+    @property
+    def font12(self):
+        return get_font(PIXEL_FONT, 12)
 
-    def to_Pos(self, pos):
-        """Convert from Box2D to Pygame coordinates."""
-        return (pos[0] * self.PPM, self.height - (pos[1] * self.PPM))
+    @property
+    def font16(self):
+        return get_font(PIXEL_FONT, 16)
 
-    def from_Pos(self, pos):
-        """Convert from Pygame to Box2D coordinates."""
-        return (pos[0] / self.PPM, (self.height - pos[1]) / self.PPM)
+    @property
+    def font32(self):
+        return get_font(PIXEL_FONT, 32)
 
     def initDeltaTime(self):
         t = self.clock.tick(60 * 2)
@@ -67,19 +89,19 @@ class Utils:
             self.fpsCounter = 0
 
         if self.fps >= 50:
-            self.drawText(Vector2(0, 0), "fps: " + str(self.fps), (0, 0, 0), self.font16)
+            return self.drawText(Vector2(0, 0), "fps: " + str(self.fps), (255, 255, 255), self.font16)
         else:
-            self.drawText(Vector2(0, 0), "fps: " + str(self.fps), (0, 0, 0), self.font16)
+            return self.drawText(Vector2(0, 0), "fps: " + str(self.fps), (255, 255, 255), self.font16)
 
     def drawText(self, pos, text, color, font):
         """Draw text at a specific position using a given font."""
-        text = font.render(text, True, color)
-        self.screen.blit(text, (pos.x, pos.y))
+        text = render_text(font, text, color)
+        return self.screen.blit(text, (pos.x, pos.y))
 
     def draw_text(self, text, position, font_size=30, color=(255, 255, 255)):
         """A simple utility to draw text centered at a position."""
-        font = pygame.font.Font(None, font_size)
-        text_surface = font.render(text, True, color)
+        font = get_font(None, font_size)
+        text_surface = render_text(font, text, color)
         text_rect = text_surface.get_rect(center=position)
         self.screen.blit(text_surface, text_rect)
 
@@ -101,4 +123,4 @@ class Utils:
         return int(r * 255), int(g * 255), int(b * 255)
 
 
-utils = Utils()  # util is global object
+utils = Utils()  # util is global object, nothing is initialized until used